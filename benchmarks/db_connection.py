@@ -0,0 +1,117 @@
+"""
+Benchmark for database connection reuse.
+
+Runs the same request cycle (request_started, one small query,
+request_finished) against the configured database with:
+
+- a fresh connection per request (CONN_MAX_AGE = 0, the old behaviour)
+- a persistent connection (CONN_MAX_AGE = DB_CONN_MAX_AGE, health checks on)
+- psycopg's pool, with --pool (needs psycopg 3 and psycopg-pool)
+
+and reports per-request latency and how many connections were opened.
+
+Usage:
+    python benchmarks/db_connection.py [--requests 200] [--pool]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "main.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core import signals  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+
+QUERY = "SELECT 1"
+
+
+def configure(conn_max_age, health_checks, pool):
+    connection.close()
+    connection.settings_dict["CONN_MAX_AGE"] = conn_max_age
+    connection.settings_dict["CONN_HEALTH_CHECKS"] = health_checks
+    options = connection.settings_dict["OPTIONS"]
+    options.pop("pool", None)
+    if pool:
+        options["pool"] = {
+            "min_size": settings.DB_POOL_MIN_SIZE,
+            "max_size": settings.DB_POOL_MAX_SIZE,
+            "timeout": settings.DB_POOL_TIMEOUT,
+        }
+
+
+def run(requests):
+    opened = []
+
+    def count(sender, connection, **kwargs):
+        opened.append(connection.alias)
+
+    connection_created.connect(count)
+    timings = []
+    try:
+        for _ in range(requests):
+            started = time.perf_counter()
+            signals.request_started.send(sender=None)
+            with connection.cursor() as cursor:
+                cursor.execute(QUERY)
+                cursor.fetchone()
+            signals.request_finished.send(sender=None)
+            timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        connection_created.disconnect(count)
+    return timings, len(opened)
+
+
+def report(name, timings, opened):
+    ordered = sorted(timings)
+    print(f"{name}")
+    print(f"  requests:    {len(timings)} ({opened} connections opened)")
+    print(f"  mean:        {statistics.mean(timings):8.2f} ms/request")
+    print(f"  median:      {statistics.median(timings):8.2f} ms/request")
+    print(f"  p95:         {ordered[int(len(ordered) * 0.95) - 1]:8.2f} ms/request")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--pool", action="store_true")
+    args = parser.parse_args()
+
+    modes = [
+        ("fresh connection per request (CONN_MAX_AGE=0)", 0, False, False),
+        (
+            f"persistent connection (CONN_MAX_AGE={settings.DB_CONN_MAX_AGE}, health checks)",
+            settings.DB_CONN_MAX_AGE,
+            True,
+            False,
+        ),
+    ]
+    if args.pool:
+        modes.append(("psycopg pool (CONN_MAX_AGE=0)", 0, False, True))
+
+    results = []
+    for name, conn_max_age, health_checks, pool in modes:
+        configure(conn_max_age, health_checks, pool)
+        timings, opened = run(args.requests)
+        report(name, timings, opened)
+        results.append(statistics.mean(timings))
+    connection.close()
+
+    baseline = results[0]
+    for (name, *_), mean in zip(modes[1:], results[1:]):
+        print(f"{name}: {baseline - mean:.2f} ms/request saved ({baseline / mean:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
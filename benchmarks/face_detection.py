@@ -0,0 +1,129 @@
+"""
+Benchmark for services.face_recognition.
+
+Compares the full-resolution detector (the original detection behaviour)
+with the downscaled pipeline and reports ms per image and match accuracy.
+
+Usage:
+    python benchmarks/face_detection.py [IMAGE_DIR] [--max-edge 800]
+        [--model hog] [--upsample 1] [--jitters 1] [--threshold 0.55]
+
+Images in sub-folders are labelled by folder name (one folder per person),
+loose images by file name. Without IMAGE_DIR only `test.jpg` is used.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from services.face_recognition import FaceDetectionOptions, encode_decoded  # noqa: E402
+from services.uploaded_image import decode_image  # noqa: E402
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+
+
+def collect_images(folder):
+    if folder is None:
+        return [("test", ROOT / "test.jpg")]
+    images = []
+    for path in sorted(Path(folder).rglob("*")):
+        if path.suffix.lower() not in IMAGE_SUFFIXES:
+            continue
+        label = path.parent.name if path.parent != Path(folder) else path.stem
+        images.append((label, path))
+    return images
+
+
+def run(images, options):
+    timings, encodings = [], []
+    for _, path in images:
+        data = path.read_bytes()
+        started = time.perf_counter()
+        found, encoding = encode_decoded(decode_image(data), options)
+        timings.append((time.perf_counter() - started) * 1000)
+        encodings.append(encoding if found else None)
+    return timings, encodings
+
+
+def identification_accuracy(images, encodings, threshold):
+    """Leave-one-out nearest neighbour over images whose label repeats."""
+    known = [(label, enc) for (label, _), enc in zip(images, encodings) if enc is not None]
+    labels = [label for label, _ in known]
+    probes = [i for i, label in enumerate(labels) if labels.count(label) > 1]
+    if not probes:
+        return None
+
+    matrix = np.stack([enc for _, enc in known])
+    correct = 0
+    for i in probes:
+        distances = np.linalg.norm(matrix - matrix[i], axis=1)
+        distances[i] = np.inf
+        best = int(np.argmin(distances))
+        correct += distances[best] <= threshold and labels[best] == labels[i]
+    return correct / len(probes)
+
+
+def report(name, images, timings, encodings, threshold):
+    detected = sum(enc is not None for enc in encodings)
+    print(f"{name}")
+    print(f"  images:   {len(images)} ({detected} with a face)")
+    print(f"  mean:     {statistics.mean(timings):8.1f} ms/image")
+    print(f"  median:   {statistics.median(timings):8.1f} ms/image")
+    print(f"  max:      {max(timings):8.1f} ms/image")
+    accuracy = identification_accuracy(images, encodings, threshold)
+    if accuracy is not None:
+        print(f"  accuracy: {accuracy:8.1%} (leave-one-out nearest neighbour)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("image_dir", nargs="?")
+    parser.add_argument("--max-edge", type=int, default=FaceDetectionOptions.max_edge)
+    parser.add_argument("--model", default=FaceDetectionOptions.model)
+    parser.add_argument("--upsample", type=int, default=FaceDetectionOptions.upsample)
+    parser.add_argument("--jitters", type=int, default=FaceDetectionOptions.num_jitters)
+    parser.add_argument("--threshold", type=float, default=0.55)
+    args = parser.parse_args()
+
+    images = collect_images(args.image_dir)
+    if not images:
+        parser.error("no images found")
+
+    baseline = FaceDetectionOptions(max_edge=0, model="hog", upsample=1, num_jitters=1)
+    tuned = FaceDetectionOptions(
+        max_edge=args.max_edge,
+        model=args.model,
+        upsample=args.upsample,
+        num_jitters=args.jitters,
+    )
+
+    base_timings, base_encodings = run(images, baseline)
+    tuned_timings, tuned_encodings = run(images, tuned)
+
+    report("full resolution (baseline)", images, base_timings, base_encodings, args.threshold)
+    report(f"downscaled {tuned}", images, tuned_timings, tuned_encodings, args.threshold)
+
+    pairs = [
+        float(np.linalg.norm(a - b))
+        for a, b in zip(base_encodings, tuned_encodings)
+        if a is not None and b is not None
+    ]
+    if pairs:
+        agree = sum(d <= args.threshold for d in pairs)
+        print("agreement with baseline")
+        print(f"  mean distance: {statistics.mean(pairs):.4f}")
+        print(f"  same identity: {agree}/{len(pairs)} at threshold {args.threshold}")
+    print(
+        f"speedup: {statistics.mean(base_timings) / statistics.mean(tuned_timings):.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
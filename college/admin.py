@@ -1,9 +1,10 @@
 from django.contrib import admin
 
 # Register your models here.
-from .models import User, University, Course, Batch, Subject
+from .models import User, University, Course, Batch, Subject, Geofence
 admin.site.register(User)
 admin.site.register(University)
 admin.site.register(Course)
 admin.site.register(Batch)
-admin.site.register(Subject)
\ No newline at end of file
+admin.site.register(Subject)
+admin.site.register(Geofence)
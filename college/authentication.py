@@ -0,0 +1,177 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+PRINCIPAL_CLAIMS = ("role", "batch_id", "is_active", "is_deleted", "is_staff")
+# When the principal claims were read from the database (unix seconds).
+PRINCIPAL_AT_CLAIM = "principal_at"
+
+
+def add_principal_claims(token, user):
+    """Embeds what role checks need into a (refresh) token for `user`."""
+    for claim in PRINCIPAL_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token[PRINCIPAL_AT_CLAIM] = int(time.time())
+    return token
+
+
+class Principal:
+    """
+    The authenticated user as far as role checks go, built without a query.
+
+    Anything beyond the claims (name, batch, face_embedding, ...) loads the
+    full User row on first access and is read from it.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id, role, batch_id, is_active, is_deleted, is_staff):
+        self.id = self.pk = user_id
+        self.role = role
+        self.batch_id = batch_id
+        self.is_active = is_active
+        self.is_deleted = is_deleted
+        self.is_staff = is_staff
+
+    @classmethod
+    def from_claims(cls, user_id, token):
+        return cls(user_id, *(token[claim] for claim in PRINCIPAL_CLAIMS))
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.pk, *(getattr(user, claim) for claim in PRINCIPAL_CLAIMS))
+
+    @cached_property
+    def user(self):
+        from college.models import User
+
+        return User.objects.get(pk=self.pk)
+
+    def __getattr__(self, name):
+        if name.startswith("__") or name == "user":
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def __eq__(self, other):
+        return getattr(other, "pk", None) == self.pk and self.pk is not None
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return f"Principal({self.pk}, {self.role})"
+
+
+class PrincipalCache:
+    """Per-process principals by user id, expiring after `ttl` seconds."""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id, not_before=0):
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        principal, cached_at = entry
+        if time.time() - cached_at > self.ttl or cached_at < not_before:
+            return None
+        return principal
+
+    def put(self, principal):
+        with self._lock:
+            self._entries[principal.pk] = (principal, time.time())
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+_principals = None
+_principals_lock = threading.Lock()
+
+
+def get_principal_cache():
+    global _principals
+    if _principals is None:
+        with _principals_lock:
+            if _principals is None:
+                _principals = PrincipalCache(settings.AUTH_PRINCIPAL_TTL)
+    return _principals
+
+
+def _revoked_key(user_id):
+    return f"auth:principal-revoked:{user_id}"
+
+
+def revoke_principal(user_id):
+    """
+    Makes cached principals and token claims read before now stale for
+    `user_id`. The marker lives in the Django cache, so a shared cache
+    backend carries revocations across processes.
+    """
+    lifetime = settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds()
+    cache.set(_revoked_key(user_id), time.time(), timeout=int(lifetime))
+    get_principal_cache().discard(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that skips the User lookup on read requests.
+
+    For SAFE_METHODS the user comes from the principal cache or, failing
+    that, from the claims embedded at login. Claims are only trusted for
+    AUTH_PRINCIPAL_TTL seconds after they were read from the database and
+    never once the user was revoked after that; otherwise the User row is
+    loaded, so a change made in another worker is seen within the TTL even
+    without a shared cache. Writes always load the real User.
+    """
+
+    def authenticate(self, request):
+        if request.method not in SAFE_METHODS:
+            return super().authenticate(request)
+
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return self.get_principal(validated_token), validated_token
+
+    def get_principal(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise AuthenticationFailed("Token contained no recognizable user identification")
+
+        revoked_at = cache.get(_revoked_key(user_id)) or 0
+        principals = get_principal_cache()
+        principal = principals.get(user_id, not_before=revoked_at)
+        if principal is None:
+            issued_at = validated_token.get(PRINCIPAL_AT_CLAIM)
+            if (
+                issued_at is not None
+                and issued_at > revoked_at
+                and time.time() - issued_at < settings.AUTH_PRINCIPAL_TTL
+            ):
+                principal = Principal.from_claims(user_id, validated_token)
+            else:
+                principal = Principal.from_user(self.get_user(validated_token))
+            principals.put(principal)
+
+        if not principal.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return principal
@@ -0,0 +1,53 @@
+import django_filters
+
+from .models import Attendance_Record, Batch, Course, Subject, University, User
+
+
+class UniversityFilter(django_filters.FilterSet):
+    class Meta:
+        model = University
+        fields = ["code"]
+
+
+class CourseFilter(django_filters.FilterSet):
+    class Meta:
+        model = Course
+        fields = ["university", "code"]
+
+
+class BatchFilter(django_filters.FilterSet):
+    university = django_filters.NumberFilter(field_name="course__university")
+
+    class Meta:
+        model = Batch
+        fields = ["course", "university", "start_year", "end_year"]
+
+
+class SubjectFilter(django_filters.FilterSet):
+    university = django_filters.NumberFilter(field_name="batch__course__university")
+
+    class Meta:
+        model = Subject
+        fields = ["batch", "faculty", "university"]
+
+
+class UserFilter(django_filters.FilterSet):
+    university = django_filters.NumberFilter(field_name="batch__course__university")
+
+    class Meta:
+        model = User
+        fields = ["role", "batch", "university", "is_active"]
+
+
+class AttendanceRecordFilter(django_filters.FilterSet):
+    batch = django_filters.NumberFilter(field_name="attendance_window__target_batch")
+    subject = django_filters.NumberFilter(field_name="attendance_window__target_subject")
+    university = django_filters.NumberFilter(
+        field_name="attendance_window__target_batch__course__university"
+    )
+    date_from = django_filters.DateFilter(field_name="date", lookup_expr="gte")
+    date_to = django_filters.DateFilter(field_name="date", lookup_expr="lte")
+
+    class Meta:
+        model = Attendance_Record
+        fields = ["user", "attendance_window", "status", "batch", "subject", "university"]
@@ -0,0 +1,132 @@
+import gzip
+import time
+from datetime import date
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+from college.utils.partitions import (
+    add_months,
+    list_partitions,
+    month_start,
+    parent_table,
+)
+
+
+def copy_to(cursor, sql, file):
+    """Streams the output of a COPY ... TO STDOUT into `file`."""
+    if not is_psycopg3:
+        cursor.copy_expert(sql, file)
+        return
+    # psycopg 3 has no copy_expert; COPY goes through cursor.copy().
+    with cursor.cursor.copy(sql) as copy:
+        for data in copy:
+            file.write(data)
+
+
+class Command(BaseCommand):
+    help = (
+        "Detach monthly attendance record partitions older than --keep-months, "
+        "dump them to compressed files and drop them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-months",
+            type=int,
+            default=12,
+            help="Months (including the current one) to keep online (default: 12).",
+        )
+        parser.add_argument(
+            "--output-dir",
+            default="archives/attendance",
+            help="Directory for the archive files.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["csv.gz", "parquet"],
+            default="csv.gz",
+            help="csv.gz (default) or parquet (requires pyarrow).",
+        )
+        parser.add_argument(
+            "--keep-table",
+            action="store_true",
+            help="Leave the detached table in the database instead of dropping it.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only list the partitions that would be archived.",
+        )
+
+    def handle(self, *args, **options):
+        if options["format"] == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise CommandError("--format parquet requires the 'pyarrow' package")
+
+        cutoff = add_months(month_start(date.today()), 1 - options["keep_months"])
+        partitions = [(name, month) for name, month in list_partitions() if month < cutoff]
+        if not partitions:
+            self.stdout.write(f"Nothing older than {cutoff} to archive")
+            return
+
+        output_dir = Path(options["output_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        for name, month in partitions:
+            if options["dry_run"]:
+                self.stdout.write(f"would archive {name}")
+                continue
+            started = time.perf_counter()
+            path = self.archive(
+                name, month, output_dir, options["format"], options["keep_table"]
+            )
+            self.stdout.write(
+                f"archived {name} -> {path} "
+                f"({path.stat().st_size / 1024:.0f} KiB, {time.perf_counter() - started:.1f}s)"
+            )
+
+    def archive(self, name, month, output_dir, file_format, keep_table):
+        quote = connection.ops.quote_name
+        parent = quote(parent_table())
+        csv_path = output_dir / f"{name}.csv.gz"
+
+        # The detach commits on its own so the parent is only locked briefly;
+        # CONCURRENTLY is not allowed while a default partition exists.
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL lock_timeout = '5s'")
+            cursor.execute(f"ALTER TABLE {parent} DETACH PARTITION {quote(name)}")
+
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                # A month of records takes longer to COPY than DB_STATEMENT_TIMEOUT.
+                cursor.execute("SET LOCAL statement_timeout = 0")
+                with gzip.open(csv_path, "wb") as archive:
+                    copy_to(
+                        cursor,
+                        f"COPY {quote(name)} TO STDOUT WITH (FORMAT csv, HEADER)",
+                        archive,
+                    )
+                if not keep_table:
+                    cursor.execute(f"DROP TABLE {quote(name)}")
+        except Exception:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"ALTER TABLE {parent} ATTACH PARTITION {quote(name)} "
+                    "FOR VALUES FROM (%s) TO (%s)",
+                    [month, add_months(month, 1)],
+                )
+            raise
+
+        if file_format == "parquet":
+            from pyarrow import csv as pa_csv, parquet
+
+            parquet_path = output_dir / f"{name}.parquet"
+            parquet.write_table(pa_csv.read_csv(csv_path), parquet_path)
+            csv_path.unlink()
+            return parquet_path
+        return csv_path
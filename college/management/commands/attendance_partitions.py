@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from college.utils.partitions import ensure_partitions, list_partitions
+
+
+class Command(BaseCommand):
+    help = "Create upcoming monthly partitions of the attendance record table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="How many months after the current one to create (default: 3).",
+        )
+
+    def handle(self, *args, **options):
+        created, failed = ensure_partitions(options["months_ahead"])
+
+        for name, moved in created:
+            suffix = f" ({moved} row(s) moved from the default partition)" if moved else ""
+            self.stdout.write(f"created {name}{suffix}")
+        for name, error in failed:
+            self.stderr.write(self.style.ERROR(f"Could not create {name}: {error}"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(created)} partition(s) created, {len(list_partitions())} in total"
+            )
+        )
+        if failed:
+            raise SystemExit(1)
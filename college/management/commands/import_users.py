@@ -0,0 +1,52 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.user_import import InvalidCSV, import_users, read_csv_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk-create users from a CSV (with header row) or JSON list file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="A .csv or .json file.")
+        parser.add_argument("--chunk-size", type=int, help="Rows per INSERT.")
+        parser.add_argument("--workers", type=int, help="Password-hashing processes.")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist")
+
+        if path.suffix.lower() == ".csv":
+            with path.open("rb") as file_obj:
+                try:
+                    rows = read_csv_rows(file_obj)
+                except InvalidCSV as e:
+                    raise CommandError(str(e))
+        elif path.suffix.lower() == ".json":
+            rows = json.loads(path.read_text(encoding="utf-8"))
+            if not isinstance(rows, list):
+                raise CommandError("JSON file must contain a list of users")
+        else:
+            raise CommandError("Only .csv and .json files are supported")
+
+        def progress(done, total):
+            self.stdout.write(f"inserted {done}/{total} valid rows")
+
+        report = import_users(
+            rows,
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            progress=progress,
+        )
+
+        for error in report.errors:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report.created}/{report.total} users created, "
+                f"{len(report.errors)} failed in {report.elapsed_ms / 1000:.1f}s"
+            )
+        )
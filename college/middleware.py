@@ -0,0 +1,65 @@
+import time
+
+from django.db import connection
+
+from college.utils.metrics import (
+    REQUEST_DB_DURATION,
+    REQUEST_DB_QUERIES,
+    REQUEST_DURATION,
+    REQUEST_STAGE_DURATION,
+)
+from college.utils.timing import StageTimer, activate
+
+
+class QueryStats:
+    """`connection.execute_wrapper` that counts and times queries."""
+
+    def __init__(self):
+        self.count = 0
+        self.ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.ms += (time.perf_counter() - started) * 1000
+
+
+class PerformanceMiddleware:
+    """
+    Records wall time, database queries and named spans of every request.
+
+    The numbers go out in the Server-Timing header and into the latency
+    histograms served at /metrics, labelled by the URL name.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = StageTimer()
+        queries = QueryStats()
+        started = time.perf_counter()
+        with activate(timer), connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        match = request.resolver_match
+        view = (match.url_name or match.view_name) if match else "unmatched"
+        method = request.method
+        REQUEST_DURATION.observe(elapsed_ms / 1000, view, method, response.status_code)
+        REQUEST_DB_DURATION.observe(queries.ms / 1000, view, method)
+        REQUEST_DB_QUERIES.inc(view, method, amount=queries.count)
+        for name, ms in timer.stages:
+            REQUEST_STAGE_DURATION.observe(ms / 1000, view, name)
+
+        metrics = [
+            f"total;dur={elapsed_ms:.2f}",
+            f'db;dur={queries.ms:.2f};desc="{queries.count} queries"',
+        ]
+        if timer.stages:
+            metrics.append(timer.server_timing())
+        response["Server-Timing"] = ", ".join(metrics)
+        return response
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-17 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('college', '0011_geofence'),
+    ]
+
+    operations = [
+        # Keep the newest record of any (user, window, date) duplicates left
+        # by concurrent double-taps so the unique constraint can be added.
+        migrations.RunSQL(
+            sql="""
+                DELETE FROM college_attendance_record a
+                USING college_attendance_record b
+                WHERE a.user_id = b.user_id
+                  AND a.attendance_window_id = b.attendance_window_id
+                  AND a.date = b.date
+                  AND a.id < b.id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='attendance_window',
+            index=models.Index(fields=['target_batch', 'target_subject', '-id'], name='att_window_batch_subject_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance_record',
+            index=models.Index(fields=['attendance_window', 'date', 'status'], name='att_record_window_date_status'),
+        ),
+        migrations.AddConstraint(
+            model_name='attendance_record',
+            constraint=models.UniqueConstraint(fields=('user', 'attendance_window', 'date'), name='uniq_attendance_record_user_window_date'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-17 16:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('college', '0012_attendance_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Attendance_Summary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('present', models.IntegerField(default=0)),
+                ('absent', models.IntegerField(default=0)),
+                ('total', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to='college.subject')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'subject'), name='uniq_attendance_summary_user_subject')],
+            },
+        ),
+        # Backfill from the records written so far.
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO college_attendance_summary
+                    (user_id, subject_id, present, absent, total, updated_at)
+                SELECT r.user_id, w.target_subject_id,
+                       count(*) FILTER (WHERE r.status = 'P'),
+                       count(*) FILTER (WHERE r.status = 'A'),
+                       count(*) FILTER (WHERE r.status IN ('P', 'A')),
+                       now()
+                FROM college_attendance_record r
+                JOIN college_attendance_window w ON w.id = r.attendance_window_id
+                WHERE w.target_subject_id IS NOT NULL
+                GROUP BY r.user_id, w.target_subject_id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.8 on 2026-10-17 17:45
+
+from django.db import migrations, models
+
+# Rebuilds college_attendance_record as a table range-partitioned by month on
+# `date`. Postgres requires the partition key in every unique constraint, so
+# the primary key becomes (id, date); ids keep coming from one sequence.
+# New months are added by `manage.py attendance_partitions` and old ones
+# moved out by `manage.py archive_attendance`.
+PARTITION_SQL = """
+-- Copying every existing record outlasts DB_STATEMENT_TIMEOUT; LOCAL keeps
+-- the change to the migration's transaction.
+SET LOCAL statement_timeout = 0;
+
+ALTER TABLE college_attendance_record RENAME TO college_attendance_record_unpartitioned;
+
+CREATE TABLE college_attendance_record (
+    id bigint NOT NULL,
+    status varchar(255) NOT NULL,
+    created_at timestamp with time zone NOT NULL,
+    date date NOT NULL,
+    attendance_window_id bigint NOT NULL
+        REFERENCES college_attendance_window (id) DEFERRABLE INITIALLY DEFERRED,
+    marked_by_id bigint NOT NULL
+        REFERENCES college_user (id) DEFERRABLE INITIALLY DEFERRED,
+    user_id bigint NOT NULL
+        REFERENCES college_user (id) DEFERRABLE INITIALLY DEFERRED,
+    PRIMARY KEY (id, date)
+) PARTITION BY RANGE (date);
+
+CREATE TABLE college_attendance_record_default
+    PARTITION OF college_attendance_record DEFAULT;
+
+DO $$
+DECLARE
+    month date := date_trunc(
+        'month',
+        coalesce((SELECT min(date) FROM college_attendance_record_unpartitioned), current_date)
+    );
+BEGIN
+    WHILE month <= date_trunc('month', current_date) + interval '3 months' LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF college_attendance_record FOR VALUES FROM (%L) TO (%L)',
+            'college_attendance_record_p' || to_char(month, 'YYYY_MM'),
+            month,
+            (month + interval '1 month')::date
+        );
+        month := (month + interval '1 month')::date;
+    END LOOP;
+END $$;
+
+INSERT INTO college_attendance_record
+    (id, status, created_at, date, attendance_window_id, marked_by_id, user_id)
+SELECT id, status, created_at, date, attendance_window_id, marked_by_id, user_id
+FROM college_attendance_record_unpartitioned;
+
+DROP TABLE college_attendance_record_unpartitioned;
+
+CREATE SEQUENCE college_attendance_record_id_seq OWNED BY college_attendance_record.id;
+SELECT setval(
+    'college_attendance_record_id_seq',
+    coalesce((SELECT max(id) FROM college_attendance_record), 0) + 1,
+    false
+);
+ALTER TABLE college_attendance_record
+    ALTER COLUMN id SET DEFAULT nextval('college_attendance_record_id_seq');
+
+ALTER TABLE college_attendance_record
+    ADD CONSTRAINT uniq_attendance_record_user_window_date
+    UNIQUE (user_id, attendance_window_id, date);
+CREATE INDEX att_record_window_date_status
+    ON college_attendance_record (attendance_window_id, date, status);
+CREATE INDEX college_attendance_record_user_id_idx
+    ON college_attendance_record (user_id);
+CREATE INDEX college_attendance_record_attendance_window_id_idx
+    ON college_attendance_record (attendance_window_id);
+CREATE INDEX college_attendance_record_marked_by_id_idx
+    ON college_attendance_record (marked_by_id);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('college', '0013_attendance_summary'),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=PARTITION_SQL),
+        migrations.AddIndex(
+            model_name='attendance_record',
+            index=models.Index(fields=['created_at'], name='att_record_created_at_idx'),
+        ),
+    ]
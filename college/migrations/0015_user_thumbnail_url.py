@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('college', '0014_partition_attendance_record'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='thumbnail_url',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from email.policy import default
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import connections, models
 from django.contrib.auth.models import (
     AbstractBaseUser,
     PermissionsMixin,
@@ -48,6 +49,38 @@ class Batch(models.Model):
         return f"{self.name} ({self.course.name})"
 
 
+class Geofence(models.Model):
+    """Campus boundary for a university, optionally narrowed to one batch."""
+
+    university = models.ForeignKey(
+        University, on_delete=models.CASCADE, related_name="geofences"
+    )
+    batch = models.ForeignKey(
+        Batch,
+        on_delete=models.CASCADE,
+        related_name="geofences",
+        null=True,
+        blank=True,
+    )
+    name = models.CharField(max_length=255, null=True, blank=True)
+    # [[[lat, lon], [lat, lon], ...], ...] - one list of vertices per polygon
+    polygons = models.JSONField(default=list)
+    is_active = models.BooleanField(default=True, db_index=True) # type: ignore[arg-type]
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def clean(self):
+        if not isinstance(self.polygons, list) or not self.polygons:
+            raise ValidationError({"polygons": "At least one polygon is required"})
+        for polygon in self.polygons:
+            if len(polygon) < 3 or any(len(vertex) != 2 for vertex in polygon):
+                raise ValidationError(
+                    {"polygons": "Each polygon needs at least 3 [lat, lon] vertices"}
+                )
+
+    def __str__(self):
+        return f"{self.name or 'Geofence'} ({self.university.name})"
+
+
 class UserManager(BaseUserManager):
     """Manager to handle user creation and hashing."""
 
@@ -114,6 +147,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     country = models.CharField(max_length=255, null=True, blank=True)
     pincode = models.CharField(max_length=20, null=True, blank=True)
     profile_picture = models.CharField(max_length=255, null=True, blank=True)
+    thumbnail_url = models.CharField(max_length=255, null=True, blank=True)
     face_embedding = VectorField(dimensions=128, null=True, blank=True)
     can_update_picture = models.BooleanField(default=False, db_index=True) # type: ignore[arg-type]
 
@@ -179,11 +213,87 @@ class Attendance_Window(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["target_batch", "target_subject", "-id"],
+                name="att_window_batch_subject_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.target_subject.name} ({self.target_batch.name})"
 
 
+class AttendanceRecordManager(models.Manager):
+    """Manager for set-based attendance record writes."""
+
+    def upsert(self, user_id, attendance_window_id, date, status, marked_by_id):
+        """
+        Inserts or updates the (user, window, date) record in one
+        INSERT ... ON CONFLICT DO UPDATE. Returns (record, created).
+
+        The window is re-checked in the same statement: if it is closed or
+        past its duration in the database, nothing is written and
+        (None, False) is returned. A worker holding a stale snapshot of a
+        closed window therefore can't overwrite the absentee rows written
+        when it closed.
+        """
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        table = quote(self.model._meta.db_table)
+        window_table = quote(Attendance_Window._meta.db_table)
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table}
+                    (user_id, attendance_window_id, date, status, marked_by_id, created_at)
+                SELECT %s, w.id, %s, %s, %s, %s
+                FROM {window_table} w
+                WHERE w.id = %s AND w.is_active
+                    AND w.start_time + w.duration * interval '1 second' > %s
+                ON CONFLICT (user_id, attendance_window_id, date) DO UPDATE
+                    SET status = EXCLUDED.status, marked_by_id = EXCLUDED.marked_by_id
+                RETURNING id, created_at, created_at = %s
+                """,
+                [
+                    user_id,
+                    date,
+                    status,
+                    marked_by_id,
+                    now,
+                    attendance_window_id,
+                    now,
+                    now,
+                ],
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None, False
+        # Partitioned tables can't return xmax; an update keeps the old
+        # created_at, so only a new row carries this statement's `now`.
+        record_id, created_at, created = row
+
+        record = self.model(
+            id=record_id,
+            user_id=user_id,
+            attendance_window_id=attendance_window_id,
+            date=date,
+            status=status,
+            marked_by_id=marked_by_id,
+            created_at=created_at,
+        )
+        record._state.adding = False
+        record._state.db = self.db
+        return record, created
+
+
 class Attendance_Record(models.Model):
+    """
+    Stored in monthly range partitions on `date` (see migration 0014), with
+    a (id, date) primary key in the database.
+    """
 
     class Status(models.TextChoices):
         PRESENT = "P", "Present"
@@ -208,3 +318,100 @@ class Attendance_Record(models.Model):
         related_name="attendance_records_marked_by",
         db_index=True,
     )
+
+    objects = AttendanceRecordManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "attendance_window", "date"],
+                name="uniq_attendance_record_user_window_date",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["attendance_window", "date", "status"],
+                name="att_record_window_date_status",
+            ),
+            models.Index(fields=["created_at"], name="att_record_created_at_idx"),
+        ]
+
+
+class AttendanceSummaryManager(models.Manager):
+
+    def refresh(self, subject_id, user_ids=None):
+        """
+        Recomputes the summary rows of one subject (optionally only for
+        `user_ids`) from Attendance_Record with a single
+        INSERT ... SELECT ... GROUP BY ... ON CONFLICT DO UPDATE.
+        """
+        if user_ids is not None and not user_ids:
+            return
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        record_table = quote(Attendance_Record._meta.db_table)
+        window_table = quote(Attendance_Window._meta.db_table)
+        summary_table = quote(self.model._meta.db_table)
+
+        user_filter = "AND r.user_id = ANY(%s)" if user_ids is not None else ""
+        params = [
+            Attendance_Record.Status.PRESENT,
+            Attendance_Record.Status.ABSENT,
+            Attendance_Record.Status.PRESENT,
+            Attendance_Record.Status.ABSENT,
+            timezone.now(),
+            subject_id,
+        ]
+        if user_ids is not None:
+            params.append(list(user_ids))
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {summary_table}
+                    (user_id, subject_id, present, absent, total, updated_at)
+                SELECT r.user_id, w.target_subject_id,
+                       count(*) FILTER (WHERE r.status = %s),
+                       count(*) FILTER (WHERE r.status = %s),
+                       count(*) FILTER (WHERE r.status IN (%s, %s)),
+                       %s
+                FROM {record_table} r
+                JOIN {window_table} w ON w.id = r.attendance_window_id
+                WHERE w.target_subject_id = %s {user_filter}
+                GROUP BY r.user_id, w.target_subject_id
+                ON CONFLICT (user_id, subject_id) DO UPDATE
+                    SET present = EXCLUDED.present,
+                        absent = EXCLUDED.absent,
+                        total = EXCLUDED.total,
+                        updated_at = EXCLUDED.updated_at
+                """,
+                params,
+            )
+
+
+class Attendance_Summary(models.Model):
+    """Per-student, per-subject attendance counts rolled up from records."""
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="attendance_summaries"
+    )
+    subject = models.ForeignKey(
+        Subject, on_delete=models.CASCADE, related_name="attendance_summaries"
+    )
+    present = models.IntegerField(default=0) # type: ignore[arg-type]
+    absent = models.IntegerField(default=0) # type: ignore[arg-type]
+    total = models.IntegerField(default=0) # type: ignore[arg-type]
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = AttendanceSummaryManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "subject"], name="uniq_attendance_summary_user_subject"
+            ),
+        ]
+
+    @property
+    def percentage(self):
+        return round(self.present * 100 / self.total, 2) if self.total else None
@@ -5,13 +5,73 @@ from .models import *
 User = get_user_model()
 
 
-class UniversitySerializer(serializers.ModelSerializer):
+def _related_paths(serializer, prefix="", in_prefetch=False):
+    """Walks nested serializer fields and returns (select_related, prefetch_related) paths."""
+    select, prefetch = [], []
+    for field in serializer.fields.values():
+        if field.source == "*":
+            continue
+        path = prefix + field.source.replace(".", "__")
+        if isinstance(field, serializers.ManyRelatedField):
+            prefetch.append(path)
+            continue
+        many = isinstance(field, serializers.ListSerializer)
+        child = field.child if many else field
+        if not isinstance(child, serializers.ModelSerializer):
+            continue
+        if many or in_prefetch:
+            prefetch.append(path)
+        else:
+            select.append(path)
+        nested_select, nested_prefetch = _related_paths(
+            child, prefix=path + "__", in_prefetch=many or in_prefetch
+        )
+        select.extend(nested_select)
+        prefetch.extend(nested_prefetch)
+    return select, prefetch
+
+
+class EagerLoadingMixin:
+    """
+    Adds `setup_eager_loading(queryset)`, which applies the select_related /
+    prefetch_related calls implied by the serializer's nested fields so
+    lists serialize in a constant number of queries.
+
+    Also accepts a `fields` keyword to serialize only a subset of fields.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None):
+        if "_eager_loading" not in cls.__dict__:
+            cls._eager_loading = {}
+            cls._field_names = frozenset(cls().fields)
+        # Names the serializer doesn't have are dropped so clients can't
+        # grow the cache with arbitrary `?fields=` values.
+        key = cls._field_names & frozenset(fields) if fields is not None else None
+        if key not in cls._eager_loading:
+            cls._eager_loading[key] = _related_paths(cls(fields=key))
+        select, prefetch = cls._eager_loading[key]
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
+
+class UniversitySerializer(EagerLoadingMixin, serializers.ModelSerializer):
     class Meta:
         model = University
         fields = "__all__"
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     # Accept a university id for write; expose nested detail for read
     university = serializers.PrimaryKeyRelatedField(queryset=University.objects.all())
     university_detail = UniversitySerializer(read_only=True, source="university")
@@ -49,7 +109,7 @@ class CourseSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class UserAdminSerializer(serializers.ModelSerializer):
+class UserAdminSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     password = serializers.CharField()
 
     class Meta:
@@ -60,7 +120,49 @@ class UserAdminSerializer(serializers.ModelSerializer):
         return User.objects.create_user(**validated_data)  # type: ignore
 
 
-class SubjectSerializer(serializers.ModelSerializer):
+class UserImportSerializer(serializers.ModelSerializer):
+    """
+    Row validation for bulk imports. Uniqueness of email/college_id and the
+    batch foreign key are checked for all rows at once by the importer.
+    """
+
+    email = serializers.EmailField()
+    password = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    college_id = serializers.CharField(
+        required=False, allow_null=True, allow_blank=True, max_length=255
+    )
+    batch = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = User
+        fields = [
+            "email",
+            "password",
+            "name",
+            "college_id",
+            "role",
+            "batch",
+            "phone",
+            "address",
+            "city",
+            "state",
+            "country",
+            "pincode",
+            "is_active",
+            "can_update_picture",
+        ]
+
+    def validate_email(self, value):
+        return User.objects.normalize_email(value)
+
+    def validate_password(self, value):
+        return value or None
+
+    def validate_college_id(self, value):
+        return value or None
+
+
+class SubjectSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     # Accept PK for batch/faculty; compute name using code + batch
     batch = serializers.PrimaryKeyRelatedField(queryset=Batch.objects.all())
     faculty = serializers.PrimaryKeyRelatedField(
@@ -97,7 +199,7 @@ class SubjectSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class BatchSerializer(serializers.ModelSerializer):
+class BatchSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     # Accept a course id for write; expose nested detail for read
     course = serializers.PrimaryKeyRelatedField(queryset=Course.objects.all())
     course_detail = CourseSerializer(read_only=True, source="course")
@@ -146,22 +248,22 @@ class BatchSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class UserStudentSerializer(serializers.ModelSerializer):
+class UserStudentSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     batch = BatchSerializer(read_only=True)
 
     class Meta:
         model = User
-        fields = ["id", "name", "email", "role", "batch", "profile_picture"]
-        read_only_fields = ["id", "name", "email", "role", "batch"]
+        fields = ["id", "name", "email", "role", "batch", "profile_picture", "thumbnail_url"]
+        read_only_fields = ["id", "name", "email", "role", "batch", "thumbnail_url"]
 
 
-class Attendance_WindowSerializer(serializers.ModelSerializer):
+class Attendance_WindowSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     class Meta:
         model = Attendance_Window
         fields = "__all__"
 
 
-class AttendanceRecordSerializer(serializers.ModelSerializer):
+class AttendanceRecordSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     user = UserStudentSerializer(read_only=True)
     attendance_window = Attendance_WindowSerializer(read_only=True)
 
@@ -0,0 +1,63 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from college.authentication import PRINCIPAL_CLAIMS, revoke_principal
+from services.face_matcher import get_face_matcher
+from services.geofence import invalidate_geofences
+from college.utils.generations import bump_generation
+from services.window_registry import get_window_registry
+from .models import Attendance_Window, Batch, Course, Geofence, Subject, University, User
+
+FACE_GALLERY_FIELDS = {"face_embedding", "batch", "batch_id"}
+PRINCIPAL_FIELDS = {*PRINCIPAL_CLAIMS, "batch"}
+
+
+@receiver(post_save, sender=User)
+def invalidate_face_gallery_on_save(sender, instance, update_fields=None, **kwargs):
+    """Drop cached galleries when a user's embedding or batch may have changed."""
+    if update_fields is not None and not FACE_GALLERY_FIELDS & set(update_fields):
+        return
+    get_face_matcher().invalidate(batch_id=instance.batch_id, user_id=instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_face_gallery_on_delete(sender, instance, **kwargs):
+    get_face_matcher().invalidate(batch_id=instance.batch_id, user_id=instance.pk)
+
+
+@receiver(post_save, sender=User)
+def revoke_principal_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """Cached principals and token claims go stale when role/batch/status may change."""
+    if created or (update_fields is not None and not PRINCIPAL_FIELDS & set(update_fields)):
+        return
+    revoke_principal(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_principal_on_delete(sender, instance, **kwargs):
+    revoke_principal(instance.pk)
+
+
+@receiver(post_save, sender=Geofence)
+@receiver(post_delete, sender=Geofence)
+def invalidate_geofence_index(sender, **kwargs):
+    invalidate_geofences()
+
+
+@receiver(post_save, sender=Attendance_Window)
+def register_attendance_window(sender, instance, **kwargs):
+    """Keeps the window registry (and its expiry schedule) in step with saves."""
+    get_window_registry().put(instance)
+
+
+@receiver(post_save, sender=University)
+@receiver(post_delete, sender=University)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Batch)
+@receiver(post_delete, sender=Batch)
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def bump_reference_generation(sender, **kwargs):
+    """Cached reference-data lists are keyed by these generations."""
+    bump_generation(sender)
@@ -1,3 +1,360 @@
+import io
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from services.user_import import InvalidCSV, read_csv_rows
+
+from . import authentication
+from .authentication import (
+    PRINCIPAL_AT_CLAIM,
+    CachedJWTAuthentication,
+    add_principal_claims,
+)
+from .models import (
+    Attendance_Record,
+    Attendance_Window,
+    Batch,
+    Course,
+    Subject,
+    University,
+    User,
+)
+from .serializers import CourseSerializer
+
+
+class ListQueryCountTests(TestCase):
+    """List endpoints must serialize in a constant number of queries."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            email="admin@example.com", password="admin", role=User.Role.ADMIN
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.rows = 0
+
+    def add_rows(self, count):
+        for _ in range(count):
+            self.rows += 1
+            n = self.rows
+            university = University.objects.create(name=f"University {n}", code=f"U{n}")
+            course = Course.objects.create(university=university, code=f"C{n}")
+            batch = Batch.objects.create(course=course, code=f"B{n}")
+            Subject.objects.create(batch=batch, code=f"S{n}a")
+            Subject.objects.create(batch=batch, code=f"S{n}b")
+            User.objects.create_user(
+                email=f"student{n}@example.com",
+                password="student",
+                role=User.Role.STUDENT,
+                batch=batch,
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assertConstantQueries(self, url):
+        self.add_rows(1)
+        few = self.count_queries(url)
+        self.add_rows(5)
+        many = self.count_queries(url)
+        self.assertEqual(few, many, f"{url} ran {few} queries for 1 row, {many} for 6")
+
+    def test_universities(self):
+        self.assertConstantQueries("/api/v1/universities/")
+
+    def test_courses(self):
+        self.assertConstantQueries("/api/v1/courses/")
+
+    def test_batches(self):
+        self.assertConstantQueries("/api/v1/batches/")
+
+    def test_subjects(self):
+        self.assertConstantQueries("/api/v1/subjects/")
+
+    def test_users(self):
+        self.assertConstantQueries("/api/v1/users/")
+
+    def test_students(self):
+        self.assertConstantQueries("/api/v1/users/students/")
+
+    def test_unknown_fields_share_one_eager_loading_entry(self):
+        for n in range(5):
+            self.client.get(f"/api/v1/courses/?fields=id,unknown{n}")
+        self.assertEqual(
+            [key for key in CourseSerializer._eager_loading if key is not None],
+            [frozenset({"id"})],
+        )
+
+
+class ReferenceCacheTests(TestCase):
+    """Reference-data lists are cached per model generation and ETagged."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            user=User.objects.create_user(
+                email="admin@example.com", password="admin", role=User.Role.ADMIN
+            )
+        )
+        University.objects.create(name="University 1", code="U1")
+
+    def test_repeat_load_skips_database(self):
+        first = self.client.get("/api/v1/universities/")
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get("/api/v1/universities/")
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(first.content, second.content)
+
+    def test_not_modified(self):
+        etag = self.client.get("/api/v1/universities/")["ETag"]
+        response = self.client.get("/api/v1/universities/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_write_invalidates(self):
+        etag = self.client.get("/api/v1/universities/")["ETag"]
+        University.objects.create(name="University 2", code="U2")
+        response = self.client.get("/api/v1/universities/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()), 2)
+
+    def test_etag_follows_body_not_local_generation(self):
+        # Another process wrote through its own cache: this process's
+        # generation counter never moved, but its cached body is gone.
+        etag = self.client.get("/api/v1/universities/")["ETag"]
+        with mock.patch("college.utils.generations.generations", return_value=[1]):
+            self.client.get("/api/v1/universities/")
+            University.objects.create(name="University 2", code="U2")
+            cache.clear()
+            response = self.client.get("/api/v1/universities/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()), 2)
+
+
+class CachedHelperTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_loads_once_per_version(self):
+        from services.cache import cached
+
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return None
+
+        self.assertIsNone(cached("test:key", loader, version=1))
+        self.assertIsNone(cached("test:key", loader, version=1))
+        self.assertEqual(len(calls), 1)
+        cached("test:key", loader, version=2)
+        self.assertEqual(len(calls), 2)
+
+    def test_loader_may_load_other_keys(self):
+        from services import cache as cache_module
+
+        def outer():
+            return [
+                cache_module.cached(f"inner:{n}", lambda n=n: n) for n in range(200)
+            ]
+
+        self.assertEqual(cache_module.cached("outer:key", outer), list(range(200)))
+        self.assertEqual(cache_module._local_locks, {})
+
+
+class AttendanceFixtures:
+    """A batch with one subject, a teacher and two students."""
+
+    def setUp(self):
+        cache.clear()
+        university = University.objects.create(name="University", code="U")
+        course = Course.objects.create(university=university, code="C")
+        self.batch = Batch.objects.create(course=course, code="B")
+        self.subject = Subject.objects.create(batch=self.batch, code="S")
+        self.teacher = User.objects.create_user(
+            email="teacher@example.com", password="teacher", role=User.Role.TEACHER
+        )
+        self.students = [
+            User.objects.create_user(
+                email=f"student{n}@example.com",
+                password="student",
+                role=User.Role.STUDENT,
+                batch=self.batch,
+            )
+            for n in range(2)
+        ]
+
+    def make_window(self, is_active=True, duration=600):
+        return Attendance_Window.objects.create(
+            target_batch=self.batch,
+            target_subject=self.subject,
+            is_active=is_active,
+            duration=duration,
+        )
+
+    def upsert(self, window, user, status=Attendance_Record.Status.PRESENT):
+        return Attendance_Record.objects.upsert(
+            user_id=user.id,
+            attendance_window_id=window.id,
+            date=timezone.localdate(),
+            status=status,
+            marked_by_id=self.teacher.id,
+        )
+
+
+class AttendanceUpsertTests(AttendanceFixtures, TestCase):
+    def test_created_then_updated(self):
+        window = self.make_window()
+        record, created = self.upsert(window, self.students[0])
+        self.assertTrue(created)
+
+        again, created = self.upsert(
+            window, self.students[0], Attendance_Record.Status.ABSENT
+        )
+        self.assertFalse(created)
+        self.assertEqual(again.id, record.id)
+        self.assertEqual(
+            Attendance_Record.objects.get(user=self.students[0]).status,
+            Attendance_Record.Status.ABSENT,
+        )
+
+    def test_closed_window_writes_nothing(self):
+        window = self.make_window(is_active=False)
+        self.assertEqual(self.upsert(window, self.students[0]), (None, False))
+        self.assertFalse(Attendance_Record.objects.exists())
+
+
+class FinalizeWindowTests(AttendanceFixtures, TestCase):
+    def test_idempotent_and_keeps_present(self):
+        from services.attendance_finalizer import finalize_window
+
+        window = self.make_window()
+        self.upsert(window, self.students[0])
+        Attendance_Window.objects.filter(pk=window.pk).update(
+            is_active=False, last_interacted_by=self.teacher
+        )
+
+        self.assertEqual(finalize_window(window.id).inserted, 1)
+        self.assertEqual(finalize_window(window.id).inserted, 0)
+        statuses = dict(
+            Attendance_Record.objects.filter(attendance_window=window).values_list(
+                "user_id", "status"
+            )
+        )
+        self.assertEqual(
+            statuses,
+            {
+                self.students[0].id: Attendance_Record.Status.PRESENT,
+                self.students[1].id: Attendance_Record.Status.ABSENT,
+            },
+        )
+
+
+class EnsurePartitionsTests(AttendanceFixtures, TestCase):
+    def test_moves_rows_out_of_default_partition(self):
+        from college.utils.partitions import add_months, ensure_partitions, partition_name
+
+        first = timezone.localdate().replace(year=timezone.localdate().year + 20, day=1)
+        months = [first, add_months(first, 1)]
+        window = self.make_window()
+        for month in months:
+            Attendance_Record.objects.create(
+                user=self.students[0],
+                attendance_window=window,
+                date=month,
+                status=Attendance_Record.Status.PRESENT,
+                marked_by=self.teacher,
+            )
+
+        created, failed = ensure_partitions(2, today=first)
+
+        self.assertEqual(failed, [])
+        self.assertEqual(
+            created,
+            [
+                (partition_name(months[0]), 1),
+                (partition_name(months[1]), 1),
+                (partition_name(add_months(first, 2)), 0),
+            ],
+        )
+        with connection.cursor() as cursor:
+            for month in months:
+                cursor.execute(f'SELECT count(*) FROM "{partition_name(month)}"')
+                self.assertEqual(cursor.fetchone()[0], 1)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        authentication._principals = None
+        self.user = User.objects.create_user(
+            email="teacher@example.com", password="teacher", role=User.Role.TEACHER
+        )
+
+    def authenticate(self, principal_at=None):
+        refresh = add_principal_claims(RefreshToken.for_user(self.user), self.user)
+        if principal_at is not None:
+            refresh[PRINCIPAL_AT_CLAIM] = int(principal_at)
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}"
+        )
+        with CaptureQueriesContext(connection) as queries:
+            principal, _ = CachedJWTAuthentication().authenticate(request)
+        return principal, len(queries)
+
+    def change_user(self, **fields):
+        """Changes the user a second after the claims are read; returns their time."""
+        principal_at = time.time()
+        time.sleep(1)
+        for name, value in fields.items():
+            setattr(self.user, name, value)
+        self.user.save()
+        return principal_at
+
+    def test_fresh_claims_need_no_query(self):
+        principal, queries = self.authenticate()
+        self.assertEqual(queries, 0)
+        self.assertEqual(principal.role, User.Role.TEACHER)
+
+    def test_expired_claims_load_the_user(self):
+        stale = time.time() - settings.AUTH_PRINCIPAL_TTL - 1
+        principal, queries = self.authenticate(principal_at=stale)
+        self.assertEqual(queries, 1)
+        self.assertEqual(principal.pk, self.user.pk)
+
+    def test_revoked_claims_load_the_user(self):
+        principal_at = self.change_user(role=User.Role.STUDENT)
+        principal, queries = self.authenticate(principal_at=principal_at)
+        self.assertEqual(queries, 1)
+        self.assertEqual(principal.role, User.Role.STUDENT)
+
+    def test_inactive_user_is_rejected(self):
+        principal_at = self.change_user(is_active=False)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(principal_at=principal_at)
+
+
+class ReadCsvRowsTests(TestCase):
+    def test_short_row_fills_missing_values_with_none(self):
+        rows = read_csv_rows(io.BytesIO(b"email,name,password\nx2@x.com\n"))
+        self.assertEqual(rows, [{"email": "x2@x.com", "name": None, "password": None}])
 
-# Create your tests here.
+    def test_non_utf8_is_invalid(self):
+        with self.assertRaises(InvalidCSV):
+            read_csv_rows(io.BytesIO(b"email\n\xff\xfe\n"))
@@ -5,7 +5,18 @@ from .views.university import UniversityListCreateView, UniversityDetailView
 from .views.course import CourseListCreateView, CourseDetailView
 from .views.batch import BatchListCreateView, BatchDetailView
 from .views.subject import SubjectListCreateView, SubjectDetailView
-from .views.attendance import AttendanceWindowView, AttendanceRecordView
+from .views.analytics import (
+    StudentAttendanceSummaryView,
+    WindowTurnoutView,
+    BatchHeatmapView,
+)
+from .views.export import UserExportView, AttendanceRecordExportView
+from .views.dashboard import DashboardBootstrapView
+from .views.attendance import (
+    AttendanceWindowView,
+    AttendanceRecordView,
+    AttendanceRecordBulkView,
+)
 
 urlpatterns = [
     # User endpoints
@@ -14,8 +25,15 @@ urlpatterns = [
     path("users/", UserView.as_view(), name="users"),
     path("users/students/", UserStudentView.as_view(), name="students"),
     path("users/<int:pk>/", UserDetailView.as_view(), name="user_detail"),
+    path("users/export/", UserExportView.as_view(), name="users-export"),
     path("me/", CurrentUserView.as_view(), name="current_user"),
     path("me/location/", UserLocationView.as_view(), name="me_location"),
+    # Normalized reference data for the management dashboard
+    path(
+        "dashboard/bootstrap/",
+        DashboardBootstrapView.as_view(),
+        name="dashboard-bootstrap",
+    ),
     # University endpoints
     path("universities/", UniversityListCreateView.as_view(), name="universities"),
     path(
@@ -40,4 +58,32 @@ urlpatterns = [
     path(
         "attendance/record/", AttendanceRecordView.as_view(), name="attendance-record"
     ),
+    # Teacher roster marking in one request
+    path(
+        "attendance/record/bulk/",
+        AttendanceRecordBulkView.as_view(),
+        name="attendance-record-bulk",
+    ),
+    # Streaming NDJSON/CSV export of attendance history
+    path(
+        "attendance/record/export/",
+        AttendanceRecordExportView.as_view(),
+        name="attendance-record-export",
+    ),
+    # Attendance analytics
+    path(
+        "attendance/analytics/students/",
+        StudentAttendanceSummaryView.as_view(),
+        name="attendance-analytics-students",
+    ),
+    path(
+        "attendance/analytics/windows/",
+        WindowTurnoutView.as_view(),
+        name="attendance-analytics-windows",
+    ),
+    path(
+        "attendance/analytics/heatmap/",
+        BatchHeatmapView.as_view(),
+        name="attendance-analytics-heatmap",
+    ),
 ]
@@ -0,0 +1,81 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from college.utils.listing import list_response
+from services.cache import cached
+
+
+class _Uncacheable(Exception):
+    """Carries an error response (e.g. invalid filters) out of the loader."""
+
+    def __init__(self, response):
+        super().__init__(response.status_code)
+        self.response = response
+
+
+def _generation_key(model):
+    return f"generation:{model._meta.label_lower}"
+
+
+def bump_generation(model):
+    """Invalidates everything cached against `model`'s current generation."""
+    key = _generation_key(model)
+    # Seeding from the clock keeps a counter that was evicted from coming
+    # back at a value that was already handed out.
+    cache.add(key, time.time_ns(), timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def generations(models):
+    """Current generation of each model, seeding missing counters."""
+    keys = [_generation_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def cached_list_response(
+    request, name, depends_on, queryset, serializer_class, filterset_class=None, view=None
+):
+    """
+    `list_response` behind a cache keyed by the generations of the models
+    the payload depends on.
+
+    The rendered JSON is cached, so a hit skips the database and the
+    serializer. The strong ETag is a hash of that body rather than of the
+    generations: with a per-process cache backend another worker's writes
+    never move this process's counters, and a 304 must not vouch for a body
+    this process would not send.
+    """
+    query = hashlib.sha256(request.GET.urlencode().encode()).hexdigest()[:16]
+    version = ".".join(str(generation) for generation in generations(depends_on))
+
+    def render():
+        response = list_response(request, queryset, serializer_class, filterset_class, view)
+        if response.status_code != status.HTTP_200_OK:
+            raise _Uncacheable(response)
+        return JSONRenderer().render(response.data)
+
+    try:
+        body = cached(f"list:{name}:{query}", render, version=version)
+    except _Uncacheable as e:
+        return e.response
+
+    etag = quote_etag(hashlib.sha256(body).hexdigest()[:32])
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return HttpResponse(body, content_type="application/json", headers=headers)
@@ -0,0 +1,61 @@
+from rest_framework import status
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+from college.utils.timing import span
+
+
+class IdCursorPagination(CursorPagination):
+    """Keyset pagination on the primary key."""
+
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+def requested_fields(request):
+    """Parses `?fields=a,b,c` into a list, or None when absent."""
+    raw = request.query_params.get("fields")
+    if not raw:
+        return None
+    return [name.strip() for name in raw.split(",") if name.strip()]
+
+
+def list_response(request, queryset, serializer_class, filterset_class=None, view=None):
+    """
+    Shared GET handler for list endpoints.
+
+    - filters from `filterset_class` are applied in SQL
+    - `?fields=` limits the serialized fields (and the related rows loaded)
+    - `?cursor=` / `?page_size=` switch to keyset pagination on `id`;
+      without them the full, id-ordered list is returned as before
+    """
+    if filterset_class is not None:
+        filterset = filterset_class(request.query_params, queryset=queryset, request=request)
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+        queryset = filterset.qs
+
+    fields = requested_fields(request)
+    queryset = serializer_class.setup_eager_loading(queryset, fields=fields)
+    context = {"request": request, "view": view}
+
+    params = request.query_params
+    if (
+        IdCursorPagination.cursor_query_param in params
+        or IdCursorPagination.page_size_query_param in params
+    ):
+        paginator = IdCursorPagination()
+        page = paginator.paginate_queryset(queryset, request, view=view)
+        serializer = serializer_class(page, many=True, context=context, fields=fields)
+        with span("serialize"):
+            data = serializer.data
+        return paginator.get_paginated_response(data)
+
+    serializer = serializer_class(
+        queryset.order_by("id"), many=True, context=context, fields=fields
+    )
+    with span("serialize"):
+        data = serializer.data
+    return Response(data, status=status.HTTP_200_OK)
@@ -0,0 +1,103 @@
+import re
+from datetime import date
+
+from django.db import DatabaseError, connection, transaction
+
+from college.models import Attendance_Record
+
+PARTITION_NAME = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def parent_table():
+    return Attendance_Record._meta.db_table
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(day, months):
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{parent_table()}_p{month:%Y_%m}"
+
+
+def default_partition():
+    return f"{parent_table()}_default"
+
+
+def list_partitions():
+    """Returns [(table_name, first_day_of_month)] of the monthly partitions."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            ORDER BY child.relname
+            """,
+            [parent_table()],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        if match := PARTITION_NAME.search(name):
+            partitions.append((name, date(int(match[1]), int(match[2]), 1)))
+    return partitions
+
+
+def create_partition(month):
+    """
+    Creates the partition for `month`. Rows of that month that already
+    landed in the default partition are moved into it in the same
+    transaction (otherwise Postgres refuses to create the partition).
+    """
+    quote = connection.ops.quote_name
+    parent, default = quote(parent_table()), quote(default_partition())
+    bounds = [month, add_months(month, 1)]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMPORARY TABLE attendance_moved AS "
+            f"WITH moved AS (DELETE FROM {default} WHERE date >= %s AND date < %s "
+            "RETURNING *) SELECT * FROM moved",
+            bounds,
+        )
+        cursor.execute(
+            f"CREATE TABLE {quote(partition_name(month))} PARTITION OF {parent} "
+            "FOR VALUES FROM (%s) TO (%s)",
+            bounds,
+        )
+        cursor.execute(f"INSERT INTO {parent} SELECT * FROM attendance_moved")
+        moved = cursor.rowcount
+        # Dropped here rather than on commit: inside an outer transaction
+        # the next month would find the table still there.
+        cursor.execute("DROP TABLE attendance_moved")
+        return moved
+
+
+def ensure_partitions(months_ahead, today=None):
+    """
+    Creates the monthly partitions from this month to `months_ahead` months
+    out. A month that fails is skipped so later months still get created.
+
+    Returns ([(name, rows moved from the default partition)], [(name, error)]).
+    """
+    first = month_start(today or date.today())
+    created, failed = [], []
+    existing = {name for name, _ in list_partitions()}
+    for offset in range(months_ahead + 1):
+        month = add_months(first, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        try:
+            created.append((name, create_partition(month)))
+        except DatabaseError as e:
+            failed.append((name, e))
+    return created, failed
@@ -0,0 +1,54 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_timer = ContextVar("stage_timer", default=None)
+
+
+class StageTimer:
+    """
+    Collects wall-clock durations of named request stages.
+
+    Usage:
+        timer = StageTimer()
+        with timer.stage("window"):
+            ...
+        response["Server-Timing"] = timer.server_timing()
+    """
+
+    def __init__(self):
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, (time.perf_counter() - started) * 1000))
+
+    def server_timing(self):
+        return ", ".join(f"{name};dur={ms:.2f}" for name, ms in self.stages)
+
+    def summary(self):
+        return " ".join(f"{name}={ms:.2f}ms" for name, ms in self.stages)
+
+
+@contextmanager
+def activate(timer):
+    """Makes `timer` the one `current_timer()` and `span()` record into."""
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+
+
+def current_timer():
+    """The timer of the request being served, or a detached one outside it."""
+    return _current_timer.get() or StageTimer()
+
+
+def span(name):
+    """Times a named stage of the current request."""
+    return current_timer().stage(name)
@@ -0,0 +1,208 @@
+from django.db.models import Count, Q
+from django.utils.dateparse import parse_date
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from college.utils.check_roles import check_allow_roles
+from ..models import Attendance_Record, Attendance_Summary, User
+
+
+def _percentage(present, total):
+    return round(present * 100 / total, 2) if total else None
+
+
+def _int_params(request, *names):
+    """Returns {name: int} for the given query params that are present."""
+    values = {}
+    for name in names:
+        raw = request.query_params.get(name)
+        if raw in (None, ""):
+            continue
+        values[name] = int(raw)
+    return values
+
+
+class StudentAttendanceSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Attendance percentage per student per subject.
+
+        Query params (all optional):
+        - user: int (students always get their own rows)
+        - subject: int
+        - batch: int
+        """
+        if allowed := check_allow_roles(
+            request.user, [User.Role.TEACHER, User.Role.ADMIN, User.Role.STUDENT]
+        ):
+            return allowed
+
+        try:
+            params = _int_params(request, "user", "subject", "batch")
+        except ValueError:
+            return Response(
+                {"message": "'user', 'subject' and 'batch' must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if request.user.role == User.Role.STUDENT:
+            params["user"] = request.user.id
+
+        summaries = Attendance_Summary.objects.all()
+        if "user" in params:
+            summaries = summaries.filter(user_id=params["user"])
+        if "subject" in params:
+            summaries = summaries.filter(subject_id=params["subject"])
+        if "batch" in params:
+            summaries = summaries.filter(subject__batch_id=params["batch"])
+
+        rows = summaries.order_by("user_id", "subject_id").values(
+            "user_id", "subject_id", "subject__code", "present", "absent", "total"
+        )
+        return Response(
+            [
+                {
+                    "user": row["user_id"],
+                    "subject": row["subject_id"],
+                    "subject_code": row["subject__code"],
+                    "present": row["present"],
+                    "absent": row["absent"],
+                    "total": row["total"],
+                    "percentage": _percentage(row["present"], row["total"]),
+                }
+                for row in rows
+            ],
+            status=status.HTTP_200_OK,
+        )
+
+
+class WindowTurnoutView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Present/absent counts per attendance window and date.
+
+        Query params:
+        - batch: int (required)
+        - subject: int (optional)
+        - date_from, date_to: YYYY-MM-DD (optional)
+        """
+        if allowed := check_allow_roles(
+            request.user, [User.Role.TEACHER, User.Role.ADMIN]
+        ):
+            return allowed
+
+        records, error = _batch_records(request)
+        if error:
+            return error
+
+        rows = (
+            records.values("attendance_window_id", "date")
+            .annotate(**_status_counts())
+            .order_by("-date", "attendance_window_id")
+        )
+        return Response(
+            [
+                {
+                    "attendance_window": row["attendance_window_id"],
+                    "date": row["date"],
+                    "present": row["present"],
+                    "absent": row["absent"],
+                    "total": row["total"],
+                    "percentage": _percentage(row["present"], row["total"]),
+                }
+                for row in rows
+            ],
+            status=status.HTTP_200_OK,
+        )
+
+
+class BatchHeatmapView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Daily attendance for a batch, one row per date.
+
+        Query params:
+        - batch: int (required)
+        - subject: int (optional)
+        - date_from, date_to: YYYY-MM-DD (optional)
+        """
+        if allowed := check_allow_roles(
+            request.user, [User.Role.TEACHER, User.Role.ADMIN]
+        ):
+            return allowed
+
+        records, error = _batch_records(request)
+        if error:
+            return error
+
+        rows = records.values("date").annotate(**_status_counts()).order_by("date")
+        return Response(
+            [
+                {
+                    "date": row["date"],
+                    "present": row["present"],
+                    "absent": row["absent"],
+                    "total": row["total"],
+                    "percentage": _percentage(row["present"], row["total"]),
+                }
+                for row in rows
+            ],
+            status=status.HTTP_200_OK,
+        )
+
+
+def _status_counts():
+    return {
+        "present": Count("id", filter=Q(status=Attendance_Record.Status.PRESENT)),
+        "absent": Count("id", filter=Q(status=Attendance_Record.Status.ABSENT)),
+        "total": Count(
+            "id",
+            filter=Q(
+                status__in=[
+                    Attendance_Record.Status.PRESENT,
+                    Attendance_Record.Status.ABSENT,
+                ]
+            ),
+        ),
+    }
+
+
+def _batch_records(request):
+    """Records of `?batch=` narrowed by subject and date range; (queryset, error)."""
+    try:
+        params = _int_params(request, "batch", "subject")
+    except ValueError:
+        return None, Response(
+            {"message": "'batch' and 'subject' must be integers"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if "batch" not in params:
+        return None, Response(
+            {"message": "'batch' query param is required"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    records = Attendance_Record.objects.filter(
+        attendance_window__target_batch_id=params["batch"]
+    )
+    if "subject" in params:
+        records = records.filter(attendance_window__target_subject_id=params["subject"])
+
+    for name, lookup in (("date_from", "date__gte"), ("date_to", "date__lte")):
+        raw = request.query_params.get(name)
+        if not raw:
+            continue
+        try:
+            value = parse_date(raw)
+        except ValueError:
+            value = None
+        if value is None:
+            return None, Response(
+                {"message": f"'{name}' must be a YYYY-MM-DD date"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        records = records.filter(**{lookup: value})
+    return records, None
@@ -1,20 +1,33 @@
-import re
-import stat
-from pgvector.django import L2Distance
+import logging
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
-from datetime import timedelta
-from shapely.geometry import Point, Polygon
 
 from college.utils.check_roles import check_allow_roles
-from services.face_recognition import has_face
-from ..models import Batch, Subject, Attendance_Window, User, Attendance_Record
+from college.utils.timing import current_timer
+from services.attendance_finalizer import finalize_window
+from services.face_executor import FaceServiceBusy, detect_face
+from services.face_matcher import face_distance, get_face_matcher
+from services.geofence import is_inside_campus
+from services.uploaded_image import InvalidImage, UploadedImage
+from services.window_registry import get_window_registry
+from ..models import (
+    Batch,
+    Subject,
+    Attendance_Window,
+    User,
+    Attendance_Record,
+    Attendance_Summary,
+)
 from ..serializers import Attendance_WindowSerializer, AttendanceRecordSerializer
 
+logger = logging.getLogger(__name__)
+
 
 class AttendanceWindowView(APIView):
 
@@ -36,39 +49,41 @@ class AttendanceWindowView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        batch = get_object_or_404(Batch, pk=batch_id)
-        subject = get_object_or_404(Subject, pk=subject_id)
-
-        if subject.batch_id != batch.id:
+        try:
+            batch_id, subject_id = int(batch_id), int(subject_id)
+        except ValueError:
             return Response(
-                {"error": "Subject does not belong to the provided batch"},
+                {"error": "'batch' and 'subject' must be integers"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        window = (
-            Attendance_Window.objects.filter(target_batch=batch, target_subject=subject)
-            .order_by("-id")
-            .first()
-        )
+        registry = get_window_registry()
+        window = registry.get(batch_id, subject_id)
 
         if not window:
+            batch = get_object_or_404(Batch, pk=batch_id)
+            subject = get_object_or_404(Subject, pk=subject_id)
+
+            if subject.batch_id != batch.id:
+                return Response(
+                    {"error": "Subject does not belong to the provided batch"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
             return Response(
                 {"message": "Attendance window not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
         # Check time validity
-        now = timezone.now()
-        window_end = window.start_time + timedelta(seconds=int(window.duration))
-        if now > window_end:
-            Attendance_Window.objects.filter(id=window.id).update(is_active=False)
+        if window.is_expired():
+            if window.is_active:
+                registry.expire([window.id])
             return Response(
                 {"message": "Attendance window is closed"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        serializer = Attendance_WindowSerializer(window)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(window.data, status=status.HTTP_200_OK)
 
     def post(self, request):
         """Create or update (upsert) attendance window for batch+subject.
@@ -98,7 +113,6 @@ class AttendanceWindowView(APIView):
 
         batch = get_object_or_404(Batch, pk=batch_id)
         subject = get_object_or_404(Subject, pk=subject_id)
-        print(batch, subject)
 
         if subject.batch_id != batch.id:
             return Response(
@@ -121,11 +135,15 @@ class AttendanceWindowView(APIView):
             if requested_active:
                 mutable_data["start_time"] = timezone.now()
 
+            was_active = existing.is_active
             serializer = Attendance_WindowSerializer(
                 existing, data=mutable_data, partial=True
             )
             if serializer.is_valid():
-                serializer.save()
+                window = serializer.save()
+                # Closing the window by hand finalizes it just like expiry.
+                if was_active and not window.is_active:
+                    finalize_window(window.id)
                 return Response(serializer.data, status=status.HTTP_200_OK)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -143,84 +161,163 @@ class AttendanceRecordView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        """Create or update attendance based on today's date (not created_at)."""
-
-        data = request.data
-        image = request.FILES.get("student_picture")
-        window_id = data.get("attendance_window")
-
-        if not window_id:
-            return Response(
-                {"message": "'attendance_window' is required"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        """Create or update attendance based on today's date (not created_at).
 
-        has_face_flag, encoding = has_face(image_file=image)
+        Checks run cheapest first so closed windows, wrong batches and
+        off-campus requests are rejected before the image is decoded.
+        Per-stage durations go out in the Server-Timing header.
+        """
+        timer = current_timer()
+        response = self._mark(request, timer)
+        logger.info(
+            "attendance record %s: %s", response.status_code, timer.summary()
+        )
+        return response
 
-        if not has_face_flag:
-            return Response(
-                {"error": "Not a valid face in the provided image"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+    def _mark(self, request, timer):
+        with timer.stage("validate"):
+            image = request.FILES.get("student_picture")
+            window_id = request.data.get("attendance_window")
 
-        if encoding is None:
-            return Response(
-                {"error": "Couldn't extract valid face data from the provided image"},
-                status=status.HTTP_403_FORBIDDEN,
-            )
+            if not window_id:
+                return Response(
+                    {"message": "'attendance_window' is required"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if not image:
+                return Response(
+                    {"message": "'student_picture' is required"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            # Size and format come from the header; pixels are decoded later.
+            try:
+                image = UploadedImage.from_file(image)
+            except InvalidImage as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         # role-based access control
-        if allowed := check_allow_roles(
-            request.user, [User.Role.TEACHER, User.Role.ADMIN, User.Role.STUDENT]
-        ):
-            return allowed
+        with timer.stage("role"):
+            if allowed := check_allow_roles(
+                request.user, [User.Role.TEACHER, User.Role.ADMIN, User.Role.STUDENT]
+            ):
+                return allowed
+
+        is_student = request.user.role == User.Role.STUDENT
+
+        with timer.stage("window"):
+            try:
+                window = get_window_registry().get_by_id(int(window_id))
+            except (TypeError, ValueError):
+                window = None
+            if rejected := self._check_window(window):
+                return rejected
+
+        # A student can only mark themselves, so everything about the target
+        # user is known before the face is looked at.
+        if is_student:
+            with timer.stage("membership"):
+                if rejected := self._check_membership(request.user, window):
+                    return rejected
+            with timer.stage("geofence"):
+                if rejected := self._check_location(request.user, window):
+                    return rejected
+
+        with timer.stage("face_encode"):
+            try:
+                has_face_flag, encoding = detect_face(image)
+            except FaceServiceBusy as e:
+                return Response(
+                    {"error": str(e)},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    headers={"Retry-After": str(e.retry_after)},
+                )
 
-        user_data = (
-            User.objects.annotate(distance=L2Distance("face_embedding", encoding))
-            .order_by("distance")
-            .first()
-        )
-        print(user_data)
-        print(user_data.distance)
+            if not has_face_flag:
+                return Response(
+                    {"error": "Not a valid face in the provided image"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-        if not user_data:
-            return Response(
-                {
-                    "error": "Couldn't find any user with the provided face. make sure you are registered and image is clear"
-                },
-                status=status.HTTP_404_NOT_FOUND,
-            )
+            if encoding is None:
+                return Response(
+                    {"error": "Couldn't extract valid face data from the provided image"},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
 
-        if user_data and user_data.distance > 0.55:
-            return Response(
-                {"error": "Face did not match!"},
-                status=status.HTTP_403_FORBIDDEN,
-            )
+        # Only compare against faces that can legitimately mark this window:
+        # a student is verified 1:1 against their own embedding, staff match
+        # within the window's batch gallery.
+        with timer.stage("face_match"):
+            if is_student:
+                distance = face_distance(encoding, request.user.face_embedding)
+            else:
+                match = get_face_matcher().best_match(encoding, window.target_batch_id)
+                distance = match.distance if match else None
+
+            if distance is None:
+                return Response(
+                    {
+                        "error": "Couldn't find any user with the provided face. make sure you are registered and image is clear"
+                    },
+                    status=status.HTTP_404_NOT_FOUND,
+                )
 
-        if request.user.role == User.Role.STUDENT:
+            if distance > settings.FACE_MATCH_THRESHOLD:
+                return Response(
+                    {"error": "Face did not match!"},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+        if is_student:
             target_user = request.user
         else:
-            if not user_data:
+            with timer.stage("membership"):
+                target_user = User.objects.filter(pk=match.user_id).first()
+                if target_user is None:
+                    return Response(
+                        {"error": "Matched user no longer exists"},
+                        status=status.HTTP_404_NOT_FOUND,
+                    )
+                if rejected := self._check_membership(target_user, window):
+                    return rejected
+            with timer.stage("geofence"):
+                if rejected := self._check_location(target_user, window):
+                    return rejected
+
+        with timer.stage("record"):
+            # One INSERT ... ON CONFLICT on (user, window, today) instead of
+            # get-then-save, so concurrent double-taps can't race.
+            record, created = Attendance_Record.objects.upsert(
+                user_id=target_user.id,
+                attendance_window_id=window.id,
+                date=timezone.localdate(),
+                status=Attendance_Record.Status.PRESENT,
+                marked_by_id=request.user.id,
+            )
+            if record is None:
+                # Closed by another worker after our snapshot was taken.
+                get_window_registry().refresh(window.id)
                 return Response(
-                    {"message": "'user' is required"},
+                    {"message": "Attendance window is not active"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            target_user = get_object_or_404(User, pk=user_data)
-
-        window = get_object_or_404(Attendance_Window, pk=window_id)
+            if window.target_subject_id:
+                Attendance_Summary.objects.refresh(
+                    window.target_subject_id, [target_user.id]
+                )
 
-        # Students can only mark their own attendance
-        if request.user.role == User.Role.STUDENT and request.user.id != target_user.id:
+        with timer.stage("serialize"):
+            serializer = AttendanceRecordSerializer(record)
             return Response(
-                {"message": "Students can only mark their own attendance"},
-                status=status.HTTP_403_FORBIDDEN,
+                serializer.data,
+                status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
             )
 
-        # Batch validation
-        if target_user.batch_id != window.target_batch_id:
+    def _check_window(self, window):
+        if window is None:
             return Response(
-                {"message": "User does not belong to the window's batch"},
-                status=status.HTTP_400_BAD_REQUEST,
+                {"message": "Attendance window not found."},
+                status=status.HTTP_404_NOT_FOUND,
             )
 
         # Check active window
@@ -230,72 +327,150 @@ class AttendanceRecordView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        today = timezone.localdate()
-
         # Check time validity
-        now = timezone.now()
-        window_end = window.start_time + timedelta(seconds=int(window.duration))
-        if now > window_end:
-            close_window = Attendance_Window.objects.filter(id=window.id).update(
-                is_active=False
-            )
+        if window.is_expired():
+            get_window_registry().expire([window.id])
             return Response(
                 {"message": "Attendance window is closed"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        return None
 
-        # Location check
-        if target_user.latitude is None or target_user.longitude is None:
+    def _check_membership(self, user, window):
+        if user.batch_id != window.target_batch_id:
+            return Response(
+                {"message": "User does not belong to the window's batch"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return None
+
+    def _check_location(self, user, window):
+        if user.latitude is None or user.longitude is None:
             return Response(
                 {"message": "User location not available"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
         try:
-            latitude = float(target_user.latitude)
-            longitude = float(target_user.longitude)
-        except:
+            latitude = float(user.latitude)
+            longitude = float(user.longitude)
+        except (TypeError, ValueError):
             return Response(
                 {"message": "Invalid user latitude/longitude"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # 25.632935, 85.101305
-        # Polygon check
-        boundary_latlon = [
-            (25.632875, 85.101206),
-            (25.632820, 85.101317),
-            (25.632982, 85.101409),
-            (25.633035, 85.101295),
-        ]
-        polygon_coords = [(lon_, lat_) for (lat_, lon_) in boundary_latlon]
-        college_polygon = Polygon(polygon_coords)
-
-        student_point = Point(longitude, latitude)
-        if not college_polygon.covers(student_point):
+        if not is_inside_campus(
+            latitude, longitude, window.university_id, window.target_batch_id
+        ):
             return Response(
                 {"message": "Student is outside the college boundary"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        return None
 
-        # ✅ Now check: does today's record already exist?
-        record, created = Attendance_Record.objects.get_or_create(
-            user=target_user,
-            attendance_window=window,
-            date=today,  # ✅ key change
-            defaults={
-                "status": Attendance_Record.Status.PRESENT,
-                "marked_by": request.user,
-            },
+
+class AttendanceRecordBulkView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    MAX_ROWS = 1000
+
+    def post(self, request):
+        """Mark a whole roster for today's date in one request.
+
+        Body fields:
+        - attendance_window: int (required)
+        - records: [{"user": int, "status": "P" | "A" | "NA"}] (required)
+
+        Rows are validated independently; the response lists one result per
+        row, either {"user", "status"} or {"user", "error"}.
+        """
+        if allowed := check_allow_roles(
+            request.user, [User.Role.TEACHER, User.Role.ADMIN]
+        ):
+            return allowed
+
+        window_id = request.data.get("attendance_window")
+        rows = request.data.get("records")
+
+        if not window_id or not isinstance(rows, list) or not rows:
+            return Response(
+                {"message": "'attendance_window' and a non-empty 'records' list are required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(rows) > self.MAX_ROWS:
+            return Response(
+                {"message": f"At most {self.MAX_ROWS} records per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            window = get_window_registry().get_by_id(int(window_id))
+        except (TypeError, ValueError):
+            window = None
+        if window is None:
+            return Response(
+                {"message": "Attendance window not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        results = []
+        statuses = {}
+        for row in rows:
+            user_id = row.get("user") if isinstance(row, dict) else None
+            record_status = row.get("status") if isinstance(row, dict) else None
+            try:
+                user_id = int(user_id)
+            except (TypeError, ValueError):
+                results.append({"user": user_id, "error": "invalid user"})
+                continue
+            if record_status not in Attendance_Record.Status.values:
+                results.append({"user": user_id, "error": "invalid status"})
+                continue
+            statuses[user_id] = record_status
+            results.append({"user": user_id, "status": record_status})
+
+        # One query for batch membership of every requested user.
+        members = set(
+            User.objects.filter(
+                pk__in=statuses.keys(), batch_id=window.target_batch_id
+            ).values_list("id", flat=True)
         )
+        for result in results:
+            if "status" in result and result["user"] not in members:
+                result.pop("status")
+                result["error"] = "not in the window's batch"
 
-        if not created:
-            record.status = Attendance_Record.Status.PRESENT
-            record.marked_by = request.user
-            record.save()
+        today = timezone.localdate()
+        records = [
+            Attendance_Record(
+                user_id=user_id,
+                attendance_window_id=window.id,
+                date=today,
+                status=record_status,
+                marked_by_id=request.user.id,
+            )
+            for user_id, record_status in statuses.items()
+            if user_id in members
+        ]
+        Attendance_Record.objects.bulk_create(
+            records,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["user", "attendance_window", "date"],
+            update_fields=["status", "marked_by"],
+        )
+        if window.target_subject_id:
+            Attendance_Summary.objects.refresh(
+                window.target_subject_id, [record.user_id for record in records]
+            )
 
-        serializer = AttendanceRecordSerializer(record)
         return Response(
-            serializer.data,
-            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+            {
+                "attendance_window": window.id,
+                "date": today,
+                "marked": len(records),
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
         )
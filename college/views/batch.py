@@ -3,7 +3,9 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
-from ..models import Batch
+from college.utils.generations import cached_list_response
+from ..models import University, Course, Batch, Subject
+from ..filters import BatchFilter
 from ..serializers import BatchSerializer
 
 
@@ -12,9 +14,16 @@ class BatchListCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        batches = Batch.objects.all()
-        serializer = BatchSerializer(batches, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Batches embed their course (with university) and subjects.
+        return cached_list_response(
+            request,
+            "batches",
+            [Batch, Course, University, Subject],
+            Batch.objects.all(),
+            BatchSerializer,
+            BatchFilter,
+            view=self,
+        )
 
     def post(self, request):
         serializer = BatchSerializer(data=request.data)
@@ -29,7 +38,9 @@ class BatchDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pk):
-        batch = get_object_or_404(Batch, pk=pk)
+        batch = get_object_or_404(
+            BatchSerializer.setup_eager_loading(Batch.objects.all()), pk=pk
+        )
         serializer = BatchSerializer(batch)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
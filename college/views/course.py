@@ -3,7 +3,9 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
-from ..models import Course
+from college.utils.generations import cached_list_response
+from ..models import University, Course
+from ..filters import CourseFilter
 from ..serializers import CourseSerializer
 
 
@@ -12,9 +14,15 @@ class CourseListCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        courses = Course.objects.all()
-        serializer = CourseSerializer(courses, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return cached_list_response(
+            request,
+            "courses",
+            [Course, University],
+            Course.objects.all(),
+            CourseSerializer,
+            CourseFilter,
+            view=self,
+        )
 
     def post(self, request):
         serializer = CourseSerializer(data=request.data)
@@ -29,7 +37,9 @@ class CourseDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pk):
-        course = get_object_or_404(Course, pk=pk)
+        course = get_object_or_404(
+            CourseSerializer.setup_eager_loading(Course.objects.all()), pk=pk
+        )
         serializer = CourseSerializer(course)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -0,0 +1,121 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.http import parse_etags, quote_etag
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+
+from college.utils.generations import generations
+from college.utils.timing import span
+from services.cache import cached
+from ..models import Batch, Course, Subject, University, User
+
+UNIVERSITY_FIELDS = {
+    "id": "id",
+    "name": "name",
+    "code": "code",
+    "address": "address",
+    "created_at": "created_at",
+}
+COURSE_FIELDS = {
+    "id": "id",
+    "university": "university_id",
+    "name": "name",
+    "code": "code",
+    "created_at": "created_at",
+}
+BATCH_FIELDS = {
+    "id": "id",
+    "course": "course_id",
+    "name": "name",
+    "code": "code",
+    "start_year": "start_year",
+    "end_year": "end_year",
+    "created_at": "created_at",
+}
+SUBJECT_FIELDS = {
+    "id": "id",
+    "batch": "batch_id",
+    "faculty": "faculty_id",
+    "name": "name",
+    "code": "code",
+    "created_at": "created_at",
+}
+USER_FIELDS = {
+    "id": "id",
+    "name": "name",
+    "email": "email",
+    "college_id": "college_id",
+    "role": "role",
+    "batch": "batch_id",
+    "is_active": "is_active",
+    "profile_picture": "profile_picture",
+    "thumbnail_url": "thumbnail_url",
+}
+
+
+def _keyed(queryset, fields):
+    """One `values_list` query turned into {id: {field: value}}."""
+    names = list(fields)
+    return {
+        row[0]: dict(zip(names, row))
+        for row in queryset.order_by("id").values_list(*fields.values())
+    }
+
+
+def _reference(name, model, fields):
+    """`_keyed` for reference data, cached until `model` is written to."""
+    [version] = generations([model])
+    return cached(
+        f"bootstrap:{name}", lambda: _keyed(model.objects.all(), fields), version=version
+    )
+
+
+def build_bootstrap(user):
+    """
+    Everything the management dashboard loads, flat and keyed by id.
+
+    Admins get every user, teachers the students, students only themselves.
+    """
+    users = User.objects.all()
+    if user.role == User.Role.TEACHER:
+        users = users.filter(role=User.Role.STUDENT)
+    elif user.role != User.Role.ADMIN:
+        users = users.filter(pk=user.pk)
+    users = _keyed(users, USER_FIELDS)
+    me = users.get(user.pk) or _keyed(User.objects.filter(pk=user.pk), USER_FIELDS)[user.pk]
+
+    return {
+        "me": me,
+        "universities": _reference("universities", University, UNIVERSITY_FIELDS),
+        "courses": _reference("courses", Course, COURSE_FIELDS),
+        "batches": _reference("batches", Batch, BATCH_FIELDS),
+        "subjects": _reference("subjects", Subject, SUBJECT_FIELDS),
+        "users": users,
+        "students": [pk for pk, row in users.items() if row["role"] == User.Role.STUDENT],
+    }
+
+
+class DashboardBootstrapView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Dashboard payload in a fixed number of queries, with a strong ETag
+        over the body so an unchanged dashboard costs a 304. `no-cache` lets
+        browsers keep the body and revalidate it on every load.
+        """
+        with span("bootstrap"):
+            payload = build_bootstrap(request.user)
+            body = json.dumps(payload, cls=DjangoJSONEncoder, sort_keys=True)
+        headers = {
+            "ETag": quote_etag(hashlib.sha256(body.encode()).hexdigest()[:32]),
+            "Cache-Control": "private, no-cache",
+        }
+
+        if headers["ETag"] in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(payload, status=status.HTTP_200_OK, headers=headers)
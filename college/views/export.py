@@ -0,0 +1,86 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from college.utils.check_roles import check_allow_roles
+from college.utils.streaming import EXPORT_FORMATS, stream_queryset
+from ..filters import AttendanceRecordFilter, UserFilter
+from ..models import Attendance_Record, User
+
+USER_EXPORT_FIELDS = {
+    "id": "id",
+    "email": "email",
+    "name": "name",
+    "college_id": "college_id",
+    "role": "role",
+    "batch": "batch_id",
+    "batch_name": "batch__name",
+    "phone": "phone",
+    "is_active": "is_active",
+    "created_at": "created_at",
+}
+
+ATTENDANCE_EXPORT_FIELDS = {
+    "id": "id",
+    "date": "date",
+    "status": "status",
+    "user": "user_id",
+    "college_id": "user__college_id",
+    "name": "user__name",
+    "attendance_window": "attendance_window_id",
+    "batch": "attendance_window__target_batch_id",
+    "subject": "attendance_window__target_subject_id",
+    "subject_code": "attendance_window__target_subject__code",
+    "marked_by": "marked_by_id",
+    "created_at": "created_at",
+}
+
+
+class _ExportView(APIView):
+
+    permission_classes = [IsAuthenticated]
+    model = None
+    filename = None
+    fields = None
+    filterset_class = None
+
+    def get(self, request):
+        """Stream every matching row.
+
+        Query params:
+        - output: "ndjson" (default) or "csv"
+        - any filter of the view's filterset
+        """
+        if allowed := check_allow_roles(request.user, [User.Role.ADMIN]):
+            return allowed
+
+        output = request.query_params.get("output", "ndjson")
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {"message": f"'output' must be one of {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        filterset = self.filterset_class(
+            request.query_params, queryset=self.model.objects.all(), request=request
+        )
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        return stream_queryset(
+            filterset.qs.order_by("id"), self.fields, output, self.filename
+        )
+
+
+class UserExportView(_ExportView):
+    model = User
+    filename = "users"
+    fields = USER_EXPORT_FIELDS
+    filterset_class = UserFilter
+
+
+class AttendanceRecordExportView(_ExportView):
+    model = Attendance_Record
+    filename = "attendance"
+    fields = ATTENDANCE_EXPORT_FIELDS
+    filterset_class = AttendanceRecordFilter
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from college.utils.metrics import registry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics_view(request):
+    """Prometheus text exposition of this process' request metrics."""
+    if not settings.METRICS_ENABLED:
+        raise Http404()
+    if request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponse("Forbidden", status=403, content_type="text/plain")
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
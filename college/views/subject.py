@@ -3,7 +3,9 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
-from ..models import Subject
+from college.utils.generations import cached_list_response
+from ..models import University, Course, Batch, Subject
+from ..filters import SubjectFilter
 from ..serializers import SubjectSerializer
 
 
@@ -12,9 +14,16 @@ class SubjectListCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        subjects = Subject.objects.all()
-        serializer = SubjectSerializer(subjects, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Subject names and filters reach through batch/course/university.
+        return cached_list_response(
+            request,
+            "subjects",
+            [Subject, Batch, Course, University],
+            Subject.objects.all(),
+            SubjectSerializer,
+            SubjectFilter,
+            view=self,
+        )
 
     def post(self, request):
         serializer = SubjectSerializer(data=request.data)
@@ -29,7 +38,9 @@ class SubjectDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pk):
-        subject = get_object_or_404(Subject, pk=pk)
+        subject = get_object_or_404(
+            SubjectSerializer.setup_eager_loading(Subject.objects.all()), pk=pk
+        )
         serializer = SubjectSerializer(subject)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -3,7 +3,9 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
+from college.utils.generations import cached_list_response
 from ..models import University
+from ..filters import UniversityFilter
 from ..serializers import UniversitySerializer
 
 
@@ -12,9 +14,15 @@ class UniversityListCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        universities = University.objects.all()
-        serializer = UniversitySerializer(universities, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return cached_list_response(
+            request,
+            "universities",
+            [University],
+            University.objects.all(),
+            UniversitySerializer,
+            UniversityFilter,
+            view=self,
+        )
 
     def post(self, request):
         serializer = UniversitySerializer(data=request.data)
@@ -29,7 +37,9 @@ class UniversityDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pk):
-        university = get_object_or_404(University, pk=pk)
+        university = get_object_or_404(
+            UniversitySerializer.setup_eager_loading(University.objects.all()), pk=pk
+        )
         serializer = UniversitySerializer(university)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -1,23 +1,27 @@
 import os
 import uuid
 
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
+from college.authentication import add_principal_claims
 from college.utils.check_roles import check_allow_roles
-from services import upload_to_supabase
-from services.face_recognition import has_face
+from college.utils.listing import list_response
+from college.utils.timing import span
+from services.face_executor import FaceServiceBusy, process_profile_picture
+from services.upload_queue import enqueue_profile_picture
+from services.uploaded_image import InvalidImage, UploadedImage
+from services.user_import import InvalidCSV, import_users, read_csv_rows
+from ..filters import UserFilter
 from ..serializers import *
 from ..models import *
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.permissions import IsAuthenticated
 
-from supabase import create_client
-from services.upload_to_supabase import upload_to_supabase
-
 
 class UserView(APIView):
 
@@ -27,18 +31,42 @@ class UserView(APIView):
         """Get all users"""
         if allowed := check_allow_roles(request.user, [User.Role.ADMIN]):
             return allowed
-        users = User.objects.all()
-        serializer = UserStudentSerializer(users, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return list_response(
+            request, User.objects.all(), UserStudentSerializer, UserFilter, view=self
+        )
 
     def post(self, request):
         """Create a new user"""
         if allowed := check_allow_roles(request.user, [User.Role.ADMIN]):
             return allowed
 
-        is_many = isinstance(request.data, list)
+        # Lists and CSV uploads go through the bulk import pipeline.
+        csv_file = request.FILES.get("file")
+        if isinstance(request.data, list) or csv_file:
+            try:
+                rows = read_csv_rows(csv_file) if csv_file else request.data
+            except InvalidCSV as e:
+                return Response({"message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            if len(rows) > settings.USER_IMPORT_MAX_HTTP_ROWS:
+                return Response(
+                    {
+                        "message": (
+                            f"At most {settings.USER_IMPORT_MAX_HTTP_ROWS} users per request; "
+                            "import larger files with `manage.py import_users`"
+                        )
+                    },
+                    status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                )
+            report = import_users(rows)
+            if not report.errors:
+                response_status = status.HTTP_201_CREATED
+            elif report.created:
+                response_status = status.HTTP_207_MULTI_STATUS
+            else:
+                response_status = status.HTTP_400_BAD_REQUEST
+            return Response(report.as_dict(), status=response_status)
 
-        serializer = UserAdminSerializer(data=request.data, many=is_many)
+        serializer = UserAdminSerializer(data=request.data)
 
         if serializer.is_valid():
             serializer.save()
@@ -63,9 +91,13 @@ class UserStudentView(APIView):
 
     def get(self, request):
         """Get all students"""
-        students = User.objects.filter(role=User.Role.STUDENT)
-        serializer = UserStudentSerializer(students, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return list_response(
+            request,
+            User.objects.filter(role=User.Role.STUDENT),
+            UserStudentSerializer,
+            UserFilter,
+            view=self,
+        )
 
 
 class UserLoginView(APIView):
@@ -82,7 +114,7 @@ class UserLoginView(APIView):
                 {"error": "Invalid Credentials"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        refresh = RefreshToken.for_user(user)
+        refresh = add_principal_claims(RefreshToken.for_user(user), user)
 
         return Response(
             {
@@ -132,32 +164,50 @@ class CurrentUserView(APIView):
         image_file = request.FILES.get("profile_picture")
 
         if image_file:
+            try:
+                upload = UploadedImage.from_file(image_file)
+            except InvalidImage as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-            has_face_flag, encoding = has_face(image_file)
+            try:
+                with span("face_encode"):
+                    has_face_flag, encoding, main, thumbnail = process_profile_picture(
+                        upload
+                    )
+            except FaceServiceBusy as e:
+                return Response(
+                    {"error": str(e)},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    headers={"Retry-After": str(e.retry_after)},
+                )
 
             if not has_face_flag:
                 return Response(
                     {"error": "No human face detected in the image."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            try:
-                user.face_embedding = encoding
-                user.save(update_fields=["face_embedding"])
-                uploaded_url = upload_to_supabase(image_file=image_file)
-            except Exception as e:
-                print("Upload Error:", e)
-                return Response(
-                    {"error": "Image upload failed", "details": str(e)},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                )
+            user.face_embedding = encoding
+            user.save(update_fields=["face_embedding"])
 
-            data["profile_picture"] = uploaded_url
+        # The file itself is uploaded in the background, not through the serializer.
+        data.pop("profile_picture", None)
 
         # Continue normal update
         serializer = UserStudentSerializer(user, data=data, partial=True)
         if serializer.is_valid():
             serializer.save(last_interacted_by=request.user)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            response_data = serializer.data
+
+            if image_file:
+                # Queued after the save above so that save can't overwrite
+                # the URL the upload writes back to profile_picture.
+                with span("upload"):
+                    image_url = enqueue_profile_picture(user.id, main, thumbnail)
+                response_data = {**response_data, "profile_picture_pending": image_url is None}
+                if image_url:
+                    response_data["profile_picture"] = image_url
+
+            return Response(response_data, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -173,7 +223,9 @@ class UserDetailView(APIView):
         if allowed := check_allow_roles(request.user, [User.Role.ADMIN]):
             return allowed
 
-        user = get_object_or_404(User, pk=pk)
+        user = get_object_or_404(
+            UserStudentSerializer.setup_eager_loading(User.objects.all()), pk=pk
+        )
 
         if user.role == User.Role.STUDENT:
             serializer = UserStudentSerializer(user)
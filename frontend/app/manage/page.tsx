@@ -2,13 +2,7 @@
 
 import { useEffect, useMemo, useState } from "react";
 import {
-  fetchMe,
-  fetchUniversities,
-  fetchCourses,
-  fetchBatches,
-  fetchSubjects,
-  fetchStudents,
-  fetchUsersAll,
+  fetchBootstrap,
   createUniversity,
   createCourse,
   createBatch,
@@ -54,27 +48,19 @@ export default function ManagePage() {
     (async () => {
       try {
         setLoading(true);
-        const meRes = await fetchMe();
-        setMe(meRes);
-        if (meRes?.role === "student") {
+        const boot = await fetchBootstrap();
+        setMe(boot.me);
+        if (boot.me?.role === "student") {
           router.replace("/dashboard");
           return;
         }
-        const [unis, crs, bats, subs] = await Promise.all([
-          fetchUniversities(),
-          fetchCourses(),
-          fetchBatches(),
-          fetchSubjects(),
-        ]);
-        setUniversities(unis as any[]);
-        setCourses(crs as any[]);
-        setBatches(bats as any[]);
-        setSubjects(subs as any[]);
-        const studs = await fetchStudents();
-        setStudents(studs as any[]);
-        if (meRes?.role === "admin") {
-          const allUsers = await fetchUsersAll();
-          setUsers(allUsers as any[]);
+        setUniversities(Object.values(boot.universities));
+        setCourses(Object.values(boot.courses));
+        setBatches(Object.values(boot.batches));
+        setSubjects(Object.values(boot.subjects));
+        setStudents(boot.students.map((id) => boot.users[id]));
+        if (boot.me?.role === "admin") {
+          setUsers(Object.values(boot.users));
         }
       } catch (e: any) {
         setError(e.message || "Failed to load data");
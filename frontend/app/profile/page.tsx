@@ -65,7 +65,12 @@ export default function ProfilePage() {
     setMessage(null);
     try {
       const updated = await updateProfile({ profile_picture: file });
-      setMe(updated);
+      // The upload finishes in the background; show the local file until then.
+      setMe(
+        updated?.profile_picture_pending
+          ? { ...updated, profile_picture: URL.createObjectURL(file) }
+          : updated
+      );
       setCurrentUser(updated);
       setMessage("Profile picture updated");
       addToast("✅ Profile picture updated successfully", "success");
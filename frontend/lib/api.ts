@@ -169,6 +169,22 @@ export async function fetchMe() {
   return apiFetch("/me/");
 }
 
+export type Bootstrap = {
+  me: any;
+  universities: Record<string, any>;
+  courses: Record<string, any>;
+  batches: Record<string, any>;
+  subjects: Record<string, any>;
+  users: Record<string, any>;
+  students: number[];
+};
+
+// Everything the management dashboard needs in one request. Relations are
+// ids; the browser revalidates the cached body with If-None-Match.
+export async function fetchBootstrap() {
+  return apiFetch<Bootstrap>("/dashboard/bootstrap/");
+}
+
 export async function fetchBatches() {
   return apiFetch("/batches/");
 }
@@ -47,13 +47,14 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "corsheaders",
     "rest_framework",
+    "django_filters",
     "college",
     "pgvector.django"
 ]
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "college.authentication.CachedJWTAuthentication",
     )
 }
 
@@ -70,6 +71,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "college.middleware.PerformanceMiddleware",
 ]
 
 CORS_ALLOWED_ORIGINS = [
@@ -105,6 +107,25 @@ WSGI_APPLICATION = "main.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connections are kept for DB_CONN_MAX_AGE seconds ("none" = forever, 0 =
+# one per request) and health-checked before reuse. DB_POOL switches to
+# psycopg's connection pool instead (psycopg 3 + psycopg-pool; Django then
+# requires CONN_MAX_AGE = 0). DB_STATEMENT_TIMEOUT (ms, 0 = off) caps every
+# query; run migrations on large tables with it set to 0. Set
+# DB_DISABLE_SERVER_SIDE_CURSORS behind a transaction-pooling PgBouncer.
+_conn_max_age = os.environ.get("DB_CONN_MAX_AGE", "60").lower()
+DB_CONN_MAX_AGE = None if _conn_max_age == "none" else int(_conn_max_age)
+DB_CONN_HEALTH_CHECKS = os.environ.get("DB_CONN_HEALTH_CHECKS", "true").lower() == "true"
+DB_POOL = os.environ.get("DB_POOL", "false").lower() == "true"
+DB_POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", 2))
+DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", 10))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 10))
+DB_CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", 5))
+DB_STATEMENT_TIMEOUT = int(os.environ.get("DB_STATEMENT_TIMEOUT", 30000))
+DB_DISABLE_SERVER_SIDE_CURSORS = (
+    os.environ.get("DB_DISABLE_SERVER_SIDE_CURSORS", "false").lower() == "true"
+)
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -113,8 +134,21 @@ DATABASES = {
         "NAME": os.environ.get("DB_NAME"),
         "USER": os.environ.get("DB_USER"),
         "PASSWORD": os.environ.get("DB_PASSWORD"),
+        "CONN_MAX_AGE": 0 if DB_POOL else DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": DB_CONN_HEALTH_CHECKS,
+        "DISABLE_SERVER_SIDE_CURSORS": DB_DISABLE_SERVER_SIDE_CURSORS,
+        "OPTIONS": {
+            "connect_timeout": DB_CONNECT_TIMEOUT,
+            "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT}",
+        },
     }
 }
+if DB_POOL:
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": DB_POOL_MIN_SIZE,
+        "max_size": DB_POOL_MAX_SIZE,
+        "timeout": DB_POOL_TIMEOUT,
+    }
 
 
 # Password validation
@@ -162,6 +196,141 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=7),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=30),
 }
+# Read requests authenticate from a per-process principal cache (and the
+# claims embedded at login) instead of loading the user. Both are trusted
+# for at most AUTH_PRINCIPAL_TTL seconds and are revoked when
+# role/batch/status change.
+AUTH_PRINCIPAL_TTL = int(os.environ.get("AUTH_PRINCIPAL_TTL", 60))
+
+# Cache
+# CACHE_BACKEND: "locmem" keeps entries per process, "file" shares them
+# between the workers of one host (under CACHE_LOCATION) and "redis" between
+# hosts (CACHE_REDIS_URL, any Redis-protocol server; needs 'redis').
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "locmem")
+CACHE_TIMEOUT = int(os.environ.get("CACHE_TIMEOUT", 300))
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", 10000))
+_CACHE_BACKENDS = {
+    "locmem": (
+        "django.core.cache.backends.locmem.LocMemCache",
+        "geofence-attendance",
+    ),
+    "file": (
+        "django.core.cache.backends.filebased.FileBasedCache",
+        os.environ.get("CACHE_LOCATION", "/var/tmp/geofence-attendance-cache"),
+    ),
+    "redis": (
+        "django.core.cache.backends.redis.RedisCache",
+        os.environ.get("CACHE_REDIS_URL", "redis://localhost:6379/1"),
+    ),
+}
+CACHES = {
+    "default": {
+        "BACKEND": _CACHE_BACKENDS[CACHE_BACKEND][0],
+        "LOCATION": _CACHE_BACKENDS[CACHE_BACKEND][1],
+        "TIMEOUT": CACHE_TIMEOUT,
+        "KEY_PREFIX": "attendance",
+    }
+}
+if CACHE_BACKEND != "redis":
+    CACHES["default"]["OPTIONS"] = {"MAX_ENTRIES": CACHE_MAX_ENTRIES}
+
+# Face recognition
+# FACE_MATCHER_BACKEND: "gallery" keeps per-batch embedding matrices in
+# process memory, "pgvector" runs every match as a database query.
+FACE_MATCHER_BACKEND = os.environ.get("FACE_MATCHER_BACKEND", "gallery")
+FACE_GALLERY_MAX_BATCHES = int(os.environ.get("FACE_GALLERY_MAX_BATCHES", 64))
+FACE_GALLERY_TTL = int(os.environ.get("FACE_GALLERY_TTL", 300))
+FACE_MATCH_THRESHOLD = float(os.environ.get("FACE_MATCH_THRESHOLD", 0.55))
+# Detection runs on a copy downscaled to FACE_DETECTION_MAX_EDGE pixels;
+# FACE_DETECTION_MODEL is "hog" (CPU) or "cnn" (needs a CUDA build of dlib).
+FACE_DETECTION_MAX_EDGE = int(os.environ.get("FACE_DETECTION_MAX_EDGE", 800))
+FACE_DETECTION_MODEL = os.environ.get("FACE_DETECTION_MODEL", "hog")
+FACE_DETECTION_UPSAMPLE = int(os.environ.get("FACE_DETECTION_UPSAMPLE", 1))
+FACE_NUM_JITTERS = int(os.environ.get("FACE_NUM_JITTERS", 1))
+# Face encoding runs in a process pool of FACE_WORKERS processes in each web
+# worker process (0 = the host's cores divided by WEB_CONCURRENCY, the
+# number of web workers, so the host runs about one per core). At most
+# FACE_QUEUE_SIZE jobs (0 = 4 per face worker) are in flight per web worker;
+# beyond that, and after FACE_JOB_TIMEOUT seconds, requests get a 503 with
+# Retry-After: FACE_RETRY_AFTER.
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", 1))
+FACE_EXECUTOR_ENABLED = os.environ.get("FACE_EXECUTOR_ENABLED", "true").lower() == "true"
+FACE_WORKERS = int(os.environ.get("FACE_WORKERS", 0))
+FACE_QUEUE_SIZE = int(os.environ.get("FACE_QUEUE_SIZE", 0))
+FACE_JOB_TIMEOUT = float(os.environ.get("FACE_JOB_TIMEOUT", 10))
+FACE_RETRY_AFTER = int(os.environ.get("FACE_RETRY_AFTER", 2))
+
+# Geofencing
+# Campus boundaries live in the Geofence table. Universities without one
+# fall back to GEOFENCE_DEFAULT_BOUNDARY, a list of (lat, lon) vertices.
+GEOFENCE_CACHE_TTL = int(os.environ.get("GEOFENCE_CACHE_TTL", 300))
+GEOFENCE_DEFAULT_BOUNDARY = [
+    (25.632875, 85.101206),
+    (25.632820, 85.101317),
+    (25.632982, 85.101409),
+    (25.633035, 85.101295),
+]
+
+# Attendance windows
+# Windows are served from a registry keyed by (batch, subject). "memory" is
+# per process with entries re-read after WINDOW_REGISTRY_TTL seconds;
+# "cache" keeps them in the Django cache (see CACHES) and "redis" shares one
+# registry between workers (needs the redis package).
+# The expiry scheduler closes windows in a background thread at expiry.
+WINDOW_REGISTRY_BACKEND = os.environ.get("WINDOW_REGISTRY_BACKEND", "memory")
+WINDOW_REGISTRY_REDIS_URL = os.environ.get("WINDOW_REGISTRY_REDIS_URL", "redis://localhost:6379/0")
+WINDOW_REGISTRY_TTL = int(os.environ.get("WINDOW_REGISTRY_TTL", 10))
+WINDOW_EXPIRY_SCHEDULER = os.environ.get("WINDOW_EXPIRY_SCHEDULER", "true").lower() == "true"
+# Closed windows get ABSENT records for students without one, inserted in
+# chunks of this many students.
+ATTENDANCE_FINALIZE_CHUNK_SIZE = int(os.environ.get("ATTENDANCE_FINALIZE_CHUNK_SIZE", 5000))
+
+# Rows fetched per server-side cursor round trip by the export endpoints
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 2000))
+
+# Bulk user import: rows per INSERT and password-hashing processes
+# (0 = one per core). Hashing runs inside the request, so the API takes at
+# most USER_IMPORT_MAX_HTTP_ROWS rows; larger files go through
+# `manage.py import_users`.
+USER_IMPORT_CHUNK_SIZE = int(os.environ.get("USER_IMPORT_CHUNK_SIZE", 500))
+USER_IMPORT_WORKERS = int(os.environ.get("USER_IMPORT_WORKERS", 0))
+USER_IMPORT_MAX_HTTP_ROWS = int(os.environ.get("USER_IMPORT_MAX_HTTP_ROWS", 200))
+
+# File storage
+# STORAGE_BACKEND: "supabase" uploads to the Supabase bucket, "local" writes
+# under LOCAL_STORAGE_ROOT (served at LOCAL_STORAGE_URL in DEBUG).
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "supabase")
+SUPABASE_URL = os.environ.get("SUPABASE_URL")
+SUPABASE_SERVICE_ROLE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+SUPABASE_BUCKET = os.environ.get("SUPABASE_BUCKET", "profile-pictures")
+LOCAL_STORAGE_ROOT = os.environ.get("LOCAL_STORAGE_ROOT", BASE_DIR / "media")
+LOCAL_STORAGE_URL = os.environ.get("LOCAL_STORAGE_URL", "/media/")
+# Profile pictures are uploaded by UPLOAD_WORKERS background threads with
+# UPLOAD_RETRIES retries, backing off from UPLOAD_RETRY_BACKOFF seconds.
+UPLOAD_ASYNC = os.environ.get("UPLOAD_ASYNC", "true").lower() == "true"
+UPLOAD_WORKERS = int(os.environ.get("UPLOAD_WORKERS", 4))
+UPLOAD_RETRIES = int(os.environ.get("UPLOAD_RETRIES", 3))
+UPLOAD_RETRY_BACKOFF = float(os.environ.get("UPLOAD_RETRY_BACKOFF", 0.5))
+# Uploaded images larger than UPLOAD_MAX_BYTES or UPLOAD_MAX_PIXELS are
+# rejected from their header, before they are decoded.
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+UPLOAD_MAX_PIXELS = int(os.environ.get("UPLOAD_MAX_PIXELS", 40_000_000))
+# Profile pictures are re-encoded without metadata as PROFILE_IMAGE_FORMAT
+# (WEBP or JPEG), fitted into PROFILE_IMAGE_MAX_EDGE pixels, plus a
+# PROFILE_THUMBNAIL_EDGE thumbnail for lists.
+PROFILE_IMAGE_FORMAT = os.environ.get("PROFILE_IMAGE_FORMAT", "WEBP").upper()
+PROFILE_IMAGE_MAX_EDGE = int(os.environ.get("PROFILE_IMAGE_MAX_EDGE", 1024))
+PROFILE_THUMBNAIL_EDGE = int(os.environ.get("PROFILE_THUMBNAIL_EDGE", 128))
+PROFILE_IMAGE_QUALITY = int(os.environ.get("PROFILE_IMAGE_QUALITY", 80))
+
+# Prometheus-text metrics at /metrics, served only to METRICS_ALLOWED_IPS
+# (comma separated).
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+METRICS_ALLOWED_IPS = [
+    ip.strip()
+    for ip in os.environ.get("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",")
+    if ip.strip()
+]
 
 # CORS (for demo)
 CORS_ALLOW_ALL_ORIGINS = True
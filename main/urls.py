@@ -14,8 +14,16 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.urls import path, include
 
+from college.views.metrics import metrics_view
+
 urlpatterns = [
     path('api/v1/', include('college.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
+
+if settings.STORAGE_BACKEND == "local":
+    urlpatterns += static(settings.LOCAL_STORAGE_URL, document_root=settings.LOCAL_STORAGE_ROOT)
@@ -0,0 +1,117 @@
+import logging
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FinalizeResult:
+    window_id: int
+    date: object
+    inserted: int
+    chunks: int
+    elapsed_ms: float
+
+
+def finalize_window(window_id, chunk_size=None):
+    """
+    Writes an ABSENT record for every student of the window's batch that has
+    no record for the window's date.
+
+    Runs as keyset-chunked INSERT ... SELECT ... ON CONFLICT DO NOTHING
+    statements, so re-running it is harmless. Summaries of the students
+    marked absent are refreshed chunk by chunk. Returns a FinalizeResult, or
+    None when the window does not exist or has nobody to attribute the
+    records to.
+    """
+    from college.models import (
+        Attendance_Record,
+        Attendance_Summary,
+        Attendance_Window,
+        User,
+    )
+
+    window = (
+        Attendance_Window.objects.filter(pk=window_id)
+        .values(
+            "target_batch_id",
+            "target_subject_id",
+            "start_time",
+            "last_interacted_by_id",
+        )
+        .first()
+    )
+    if not window or not window["target_batch_id"]:
+        return None
+    if not window["last_interacted_by_id"]:
+        logger.warning("Not finalizing attendance window %s: no marked_by user", window_id)
+        return None
+
+    chunk_size = chunk_size or settings.ATTENDANCE_FINALIZE_CHUNK_SIZE
+    date = timezone.localdate(window["start_time"])
+    record_table = connection.ops.quote_name(Attendance_Record._meta.db_table)
+    user_table = connection.ops.quote_name(User._meta.db_table)
+
+    started = time.perf_counter()
+    inserted = chunks = 0
+    last_id = 0
+    with connection.cursor() as cursor:
+        while last_id is not None:
+            cursor.execute(
+                f"""
+                WITH chunk AS (
+                    SELECT id FROM {user_table}
+                    WHERE batch_id = %s AND role = %s AND NOT is_deleted AND id > %s
+                    ORDER BY id
+                    LIMIT %s
+                ), inserted AS (
+                    INSERT INTO {record_table}
+                        (user_id, attendance_window_id, date, status, marked_by_id, created_at)
+                    SELECT id, %s, %s, %s, %s, %s FROM chunk
+                    ON CONFLICT (user_id, attendance_window_id, date) DO NOTHING
+                    RETURNING user_id
+                )
+                SELECT (SELECT max(id) FROM chunk), (SELECT array_agg(user_id) FROM inserted)
+                """,
+                [
+                    window["target_batch_id"],
+                    User.Role.STUDENT,
+                    last_id,
+                    chunk_size,
+                    window_id,
+                    date,
+                    Attendance_Record.Status.ABSENT,
+                    window["last_interacted_by_id"],
+                    timezone.now(),
+                ],
+            )
+            last_id, absent_ids = cursor.fetchone()
+            chunks += 1
+            if absent_ids:
+                inserted += len(absent_ids)
+                if window["target_subject_id"]:
+                    Attendance_Summary.objects.refresh(
+                        window["target_subject_id"], absent_ids
+                    )
+
+    result = FinalizeResult(
+        window_id=window_id,
+        date=date,
+        inserted=inserted,
+        chunks=chunks,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+    logger.info(
+        "Finalized attendance window %s for %s: %s absent in %s chunks, %.1f ms",
+        window_id,
+        date,
+        inserted,
+        chunks,
+        result.elapsed_ms,
+    )
+    return result
@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from college.utils.metrics import Counter, registry
+
+logger = logging.getLogger(__name__)
+
+CACHE_REQUESTS = registry.register(
+    Counter(
+        "app_cache_requests_total",
+        "Application cache lookups, by key prefix and result.",
+        ["name", "result"],
+    )
+)
+
+# Values are stored wrapped so a cached None is told apart from a miss.
+_MISSING = object()
+# One lock per key being loaded, with its number of holders and waiters;
+# dropped when the last one leaves so the dict only holds keys in flight.
+_local_locks = {}
+_local_locks_guard = threading.Lock()
+
+
+def record(name, hit):
+    CACHE_REQUESTS.inc(name, "hit" if hit else "miss")
+
+
+@contextmanager
+def _local_lock(key):
+    """
+    A lock of this process for `key` alone, so a loader that itself loads
+    other keys never waits on a lock it merely shares with them.
+    """
+    with _local_locks_guard:
+        entry = _local_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _local_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _local_locks[key]
+
+
+@contextmanager
+def single_flight(key, lock_timeout=10.0):
+    """
+    Serializes the loading of `key`: threads of this process queue on a
+    local lock, processes sharing the cache on a short-lived lock key.
+    Callers re-check the cache once inside. After `lock_timeout` seconds a
+    waiter stops waiting for another process and loads anyway.
+    """
+    with _local_lock(key):
+        lock_key = f"lock:{key}"
+        deadline = time.monotonic() + lock_timeout
+        while not (locked := cache.add(lock_key, 1, timeout=lock_timeout)):
+            if time.monotonic() >= deadline:
+                logger.warning("Timed out waiting for %s to be loaded elsewhere", key)
+                break
+            time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if locked:
+                cache.delete(lock_key)
+
+
+def _lookup(key, version):
+    entry = cache.get(key, version=version)
+    return entry[0] if entry is not None else _MISSING
+
+
+def cached(key, loader, ttl=DEFAULT_TIMEOUT, version=None):
+    """
+    Returns the value cached under `key`/`version`, calling `loader()` to
+    fill it on a miss. Misses are single-flight, so a cold or invalidated
+    key is loaded once rather than by every concurrent request. `ttl`
+    defaults to the backend's TIMEOUT; a new `version` makes older entries
+    misses.
+    """
+    name = key.split(":", 1)[0]
+    value = _lookup(key, version)
+    if value is not _MISSING:
+        record(name, hit=True)
+        return value
+
+    with single_flight(f"{key}:{version}"):
+        value = _lookup(key, version)
+        record(name, hit=value is not _MISSING)
+        if value is _MISSING:
+            value = loader()
+            cache.set(key, (value,), timeout=ttl, version=version)
+    return value
@@ -0,0 +1,140 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from services.face_recognition import FaceDetectionOptions, encode_upload
+from services.image_processing import ImageOptions
+from services.image_processing import process_profile_picture as _process_profile_picture
+
+
+class FaceServiceBusy(Exception):
+    """Raised when the face pool cannot take or finish a job in time."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _init_worker():
+    # Importing face_recognition loads the dlib detector, shape predictor
+    # and encoder once per worker; a tiny detection pages them in.
+    import numpy as np
+    import face_recognition
+
+    face_recognition.face_locations(np.zeros((32, 32, 3), dtype=np.uint8))
+
+
+class FaceExecutor:
+    """
+    A process pool for dlib work with a bounded number of in-flight jobs.
+
+    Jobs beyond `queue_size` are refused immediately with FaceServiceBusy
+    instead of piling up behind a slow encode.
+    """
+
+    def __init__(self, workers, queue_size, timeout, retry_after):
+        self.workers = workers
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._pool
+
+    def _reset_pool(self, pool):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise FaceServiceBusy("Face service is busy, try again shortly", self.retry_after)
+
+        pool = self._get_pool()
+        try:
+            future = pool.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is only freed once the worker is actually done, so jobs
+        # that outlive their timeout still count against the queue.
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise FaceServiceBusy("Face processing timed out", self.retry_after)
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            raise FaceServiceBusy("Face service restarted, try again", self.retry_after)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_face_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # Each web worker has its own pool, so they share the cores.
+                workers = settings.FACE_WORKERS or max(
+                    1, (os.cpu_count() or 1) // settings.WEB_CONCURRENCY
+                )
+                _executor = FaceExecutor(
+                    workers=workers,
+                    queue_size=settings.FACE_QUEUE_SIZE or workers * 4,
+                    timeout=settings.FACE_JOB_TIMEOUT,
+                    retry_after=settings.FACE_RETRY_AFTER,
+                )
+    return _executor
+
+
+def detect_face(upload):
+    """
+    Same contract as `encode_upload`, but the decode and encode run in the
+    face process pool when `FACE_EXECUTOR_ENABLED` is set.
+
+    Raises:
+        FaceServiceBusy: the pool is saturated or the job timed out.
+    """
+    options = FaceDetectionOptions.from_settings()
+
+    if not settings.FACE_EXECUTOR_ENABLED:
+        return encode_upload(upload, options)
+    return get_face_executor().run(encode_upload, upload, options)
+
+
+def process_profile_picture(upload):
+    """
+    Like `detect_face`, but also renders the normalized profile picture and
+    thumbnail from the same decode.
+
+    Returns:
+        (has_face, encoding, main: ProcessedImage, thumbnail: ProcessedImage)
+
+    Raises:
+        FaceServiceBusy: the pool is saturated or the job timed out.
+    """
+    args = (upload, FaceDetectionOptions.from_settings(), ImageOptions.from_settings())
+
+    if not settings.FACE_EXECUTOR_ENABLED:
+        return _process_profile_picture(*args)
+    return get_face_executor().run(_process_profile_picture, *args)
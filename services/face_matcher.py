@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+from django.conf import settings
+from pgvector.django import L2Distance
+
+
+class FaceMatch(NamedTuple):
+    user_id: int
+    distance: float
+
+
+class PgVectorMatcher:
+    """
+    Nearest-neighbour search delegated to Postgres (one query per match).
+
+    Matches are exact: the batch's rows come from the batch_id index and
+    are sorted by distance. An approximate (HNSW) index would apply the
+    batch filter after its candidate list and could miss the batch entirely.
+    """
+
+    def best_match(self, encoding, batch_id):
+        from college.models import User
+
+        user = (
+            User.objects.filter(batch_id=batch_id, face_embedding__isnull=False)
+            .annotate(distance=L2Distance("face_embedding", encoding))
+            .order_by("distance")
+            .only("id")
+            .first()
+        )
+        if user is None:
+            return None
+        return FaceMatch(user.id, float(user.distance))
+
+    def invalidate(self, batch_id=None, user_id=None):
+        pass
+
+
+class _Gallery(NamedTuple):
+    user_ids: np.ndarray
+    embeddings: np.ndarray
+    loaded_at: float
+
+
+class BatchGalleryMatcher:
+    """
+    Keeps each batch's face embeddings in a contiguous float32 matrix and
+    matches with a single vectorized distance computation.
+
+    Galleries are held in an LRU of `max_batches` entries and expire after
+    `ttl` seconds so other worker processes eventually see changes they did
+    not invalidate themselves.
+    """
+
+    def __init__(self, max_batches=64, ttl=300):
+        self.max_batches = max_batches
+        self.ttl = ttl
+        self._galleries: OrderedDict[int, _Gallery] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, batch_id) -> _Gallery:
+        from college.models import User
+
+        rows = list(
+            User.objects.filter(
+                batch_id=batch_id, face_embedding__isnull=False
+            ).values_list("id", "face_embedding")
+        )
+        user_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        embeddings = np.empty((len(rows), 128), dtype=np.float32)
+        for i, (_, embedding) in enumerate(rows):
+            embeddings[i] = embedding
+        return _Gallery(user_ids, embeddings, time.monotonic())
+
+    def _get(self, batch_id) -> _Gallery:
+        with self._lock:
+            gallery = self._galleries.get(batch_id)
+            if gallery and time.monotonic() - gallery.loaded_at < self.ttl:
+                self._galleries.move_to_end(batch_id)
+                return gallery
+
+        gallery = self._load(batch_id)
+
+        with self._lock:
+            self._galleries[batch_id] = gallery
+            self._galleries.move_to_end(batch_id)
+            while len(self._galleries) > self.max_batches:
+                self._galleries.popitem(last=False)
+        return gallery
+
+    def best_match(self, encoding, batch_id):
+        gallery = self._get(batch_id)
+        if len(gallery.user_ids) == 0:
+            return None
+
+        probe = np.asarray(encoding, dtype=np.float32)
+        distances = np.linalg.norm(gallery.embeddings - probe, axis=1)
+        best = int(np.argmin(distances))
+        return FaceMatch(int(gallery.user_ids[best]), float(distances[best]))
+
+    def invalidate(self, batch_id=None, user_id=None):
+        """Drop the gallery for `batch_id` and any cached gallery holding `user_id`."""
+        with self._lock:
+            stale = {batch_id} if batch_id is not None else set()
+            if user_id is not None:
+                stale.update(
+                    key
+                    for key, gallery in self._galleries.items()
+                    if user_id in gallery.user_ids
+                )
+            for key in stale:
+                self._galleries.pop(key, None)
+
+
+def face_distance(encoding, embedding):
+    """L2 distance between a probe encoding and a stored embedding."""
+    if embedding is None:
+        return None
+    probe = np.asarray(encoding, dtype=np.float32)
+    return float(np.linalg.norm(np.asarray(embedding, dtype=np.float32) - probe))
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_face_matcher():
+    """Returns the process-wide matcher selected by `FACE_MATCHER_BACKEND`."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                backend = getattr(settings, "FACE_MATCHER_BACKEND", "gallery")
+                if backend == "pgvector":
+                    _matcher = PgVectorMatcher()
+                else:
+                    _matcher = BatchGalleryMatcher(
+                        max_batches=getattr(settings, "FACE_GALLERY_MAX_BATCHES", 64),
+                        ttl=getattr(settings, "FACE_GALLERY_TTL", 300),
+                    )
+    return _matcher
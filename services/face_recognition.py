@@ -1,34 +1,84 @@
-import io
+from dataclasses import dataclass
+
 from PIL import Image
 import face_recognition
 import numpy as np
 
 
-def has_face(image_file):
+@dataclass(frozen=True)
+class FaceDetectionOptions:
+    max_edge: int = 800
+    model: str = "hog"
+    upsample: int = 1
+    num_jitters: int = 1
+
+    @classmethod
+    def from_settings(cls):
+        from django.conf import settings
+
+        return cls(
+            max_edge=getattr(settings, "FACE_DETECTION_MAX_EDGE", cls.max_edge),
+            model=getattr(settings, "FACE_DETECTION_MODEL", cls.model),
+            upsample=getattr(settings, "FACE_DETECTION_UPSAMPLE", cls.upsample),
+            num_jitters=getattr(settings, "FACE_NUM_JITTERS", cls.num_jitters),
+        )
+
+
+def detect_faces(pil_img, options):
     """
-    Returns:
-        (has_face: bool, encoding: np.ndarray or None)
+    Runs detection on a copy downscaled to `options.max_edge` and maps the
+    boxes back to the coordinates of `pil_img`.
     """
-    file_bytes = image_file.read()
-    if not file_bytes:
-        return False, None
+    scale = 1.0
+    small = pil_img
+    longest = max(pil_img.size)
+    if options.max_edge and longest > options.max_edge:
+        scale = longest / options.max_edge
+        small = pil_img.copy()
+        small.thumbnail((options.max_edge, options.max_edge), Image.Resampling.BILINEAR)
+
+    faces = face_recognition.face_locations(
+        np.asarray(small),
+        number_of_times_to_upsample=options.upsample,
+        model=options.model,
+    )
+    width, height = pil_img.size
+    return [
+        (
+            max(0, int(top * scale)),
+            min(width, int(right * scale)),
+            min(height, int(bottom * scale)),
+            max(0, int(left * scale)),
+        )
+        for top, right, bottom, left in faces
+    ]
 
-    pil_img = Image.open(io.BytesIO(file_bytes))
-    if pil_img.mode not in ["RGB", "L"]:
-        pil_img = pil_img.convert("RGB")
 
-    image = np.array(pil_img)
+def encode_upload(upload, options=None):
+    """`encode_decoded` for an UploadedImage, decoding it only if not done yet."""
+    return encode_decoded(upload.image, options)
 
-    faces = face_recognition.face_locations(image)
+
+def encode_decoded(pil_img, options=None):
+    """
+    Encodes the first face found in an image decoded by `decode_image`.
+
+    Returns:
+        (has_face: bool, encoding: np.ndarray or None)
+    """
+    options = options or FaceDetectionOptions.from_settings()
+
+    faces = detect_faces(pil_img, options)
     if len(faces) == 0:
-        image_file.seek(0)
         return False, None
 
-    encodings = face_recognition.face_encodings(image, known_face_locations=faces)
+    encodings = face_recognition.face_encodings(
+        np.asarray(pil_img),
+        known_face_locations=faces[:1],
+        num_jitters=options.num_jitters,
+    )
     if len(encodings) == 0:
-        image_file.seek(0)
         return False, None
 
-    image_file.seek(0)
-
     return True, encodings[0]
+
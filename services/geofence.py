@@ -0,0 +1,105 @@
+import threading
+import time
+
+from django.conf import settings
+from shapely import STRtree
+from shapely.geometry import Point, Polygon
+from shapely.prepared import prep
+
+
+def build_polygon(boundary_latlon):
+    """Shapely works in (x, y) = (lon, lat); the database stores [lat, lon]."""
+    return Polygon([(float(lon), float(lat)) for lat, lon in boundary_latlon])
+
+
+class GeofenceIndex:
+    """
+    Prepared geometries for every active geofence behind one STRtree.
+
+    A batch with its own geofences is checked only against those; other
+    batches fall back to their university's campus-wide geofences.
+    """
+
+    def __init__(self, fences):
+        # fences: iterable of (university_id, batch_id, [[lat, lon], ...])
+        self._owners = []
+        geometries = []
+        for university_id, batch_id, boundary in fences:
+            self._owners.append((university_id, batch_id))
+            geometries.append(build_polygon(boundary))
+
+        self._prepared = [prep(geometry) for geometry in geometries]
+        self._tree = STRtree(geometries) if geometries else None
+        self._batch_ids = {batch for _, batch in self._owners if batch is not None}
+        self._university_ids = {uni for uni, batch in self._owners if batch is None}
+        self.loaded_at = time.monotonic()
+
+    def covers(self, latitude, longitude, university_id, batch_id):
+        """
+        Returns True/False, or None when no geofence is configured for the
+        batch or its university.
+        """
+        if batch_id in self._batch_ids:
+            scope = (university_id, batch_id)
+        elif university_id in self._university_ids:
+            scope = (university_id, None)
+        else:
+            return None
+
+        point = Point(longitude, latitude)
+        for i in self._tree.query(point):
+            owner = self._owners[i]
+            if owner[1] == scope[1] and (scope[1] is not None or owner[0] == scope[0]):
+                if self._prepared[i].covers(point):
+                    return True
+        return False
+
+
+_index = None
+_index_lock = threading.Lock()
+_default_boundary = None
+
+
+def _load_index():
+    from college.models import Geofence
+
+    fences = []
+    for university_id, batch_id, polygons in Geofence.objects.filter(
+        is_active=True
+    ).values_list("university_id", "batch_id", "polygons"):
+        fences.extend((university_id, batch_id, polygon) for polygon in polygons)
+    return GeofenceIndex(fences)
+
+
+def get_geofence_index():
+    global _index
+    index = _index
+    if index is None or time.monotonic() - index.loaded_at > settings.GEOFENCE_CACHE_TTL:
+        with _index_lock:
+            index = _index
+            if index is None or time.monotonic() - index.loaded_at > settings.GEOFENCE_CACHE_TTL:
+                index = _index = _load_index()
+    return index
+
+
+def invalidate_geofences():
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def is_inside_campus(latitude, longitude, university_id, batch_id):
+    """
+    Checks a point against the configured geofences, falling back to
+    `GEOFENCE_DEFAULT_BOUNDARY` for universities without any.
+    """
+    global _default_boundary
+    inside = get_geofence_index().covers(latitude, longitude, university_id, batch_id)
+    if inside is not None:
+        return inside
+
+    if not settings.GEOFENCE_DEFAULT_BOUNDARY:
+        return False
+    if _default_boundary is None:
+        _default_boundary = prep(build_polygon(settings.GEOFENCE_DEFAULT_BOUNDARY))
+    return _default_boundary.covers(Point(longitude, latitude))
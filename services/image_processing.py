@@ -0,0 +1,75 @@
+import io
+from dataclasses import dataclass
+
+from PIL import Image
+
+from services.face_recognition import FaceDetectionOptions, encode_decoded
+
+CONTENT_TYPES = {"WEBP": "image/webp", "JPEG": "image/jpeg"}
+
+
+@dataclass(frozen=True)
+class ImageOptions:
+    max_edge: int = 1024
+    thumbnail_edge: int = 128
+    format: str = "WEBP"
+    quality: int = 80
+
+    @classmethod
+    def from_settings(cls):
+        from django.conf import settings
+
+        return cls(
+            max_edge=getattr(settings, "PROFILE_IMAGE_MAX_EDGE", cls.max_edge),
+            thumbnail_edge=getattr(settings, "PROFILE_THUMBNAIL_EDGE", cls.thumbnail_edge),
+            format=getattr(settings, "PROFILE_IMAGE_FORMAT", cls.format).upper(),
+            quality=getattr(settings, "PROFILE_IMAGE_QUALITY", cls.quality),
+        )
+
+
+@dataclass(frozen=True)
+class ProcessedImage:
+    data: bytes
+    content_type: str
+    ext: str
+
+
+def render(pil_img, max_edge, options):
+    """
+    Re-encodes `pil_img` fitted into `max_edge` pixels. Only pixel data is
+    written, so EXIF (GPS, camera, ...) and other metadata are dropped.
+    """
+    img = pil_img.copy()
+    img.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    img.save(buffer, format=options.format, quality=options.quality, optimize=True)
+    return ProcessedImage(
+        data=buffer.getvalue(),
+        content_type=CONTENT_TYPES[options.format],
+        ext="jpg" if options.format == "JPEG" else options.format.lower(),
+    )
+
+
+def process_profile_picture(upload, face_options=None, image_options=None):
+    """
+    Decodes an UploadedImage once, then finds the face encoding and renders
+    the normalized main image and thumbnail from the same decoded image.
+
+    Returns:
+        (has_face: bool, encoding or None, main: ProcessedImage or None,
+         thumbnail: ProcessedImage or None)
+    """
+    if not upload:
+        return False, None, None, None
+
+    face_options = face_options or FaceDetectionOptions.from_settings()
+    image_options = image_options or ImageOptions.from_settings()
+
+    pil_img = upload.image
+    found, encoding = encode_decoded(pil_img, face_options)
+    if not found:
+        return False, None, None, None
+
+    main = render(pil_img, image_options.max_edge, image_options)
+    thumbnail = render(pil_img, image_options.thumbnail_edge, image_options)
+    return True, encoding, main, thumbnail
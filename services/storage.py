@@ -0,0 +1,80 @@
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+
+class StorageError(Exception):
+    pass
+
+
+class SupabaseStorage:
+    """Supabase Storage bucket behind one client shared by the process."""
+
+    def __init__(self, url, key, bucket):
+        if not url or not key:
+            raise StorageError("Supabase credentials not configured")
+        self.url = url
+        self.key = key
+        self.bucket = bucket
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        # create_client sets up the HTTP session and auth once; reusing it
+        # keeps connections (and TLS sessions) alive between uploads.
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from supabase import create_client
+
+                    self._client = create_client(self.url, self.key)
+        return self._client
+
+    def upload(self, name, data, content_type):
+        bucket = self.client.storage.from_(self.bucket)
+        res = bucket.upload(name, data, file_options={"content-type": content_type})
+
+        # SDK error handler
+        if hasattr(res, "error") and res.error:
+            raise StorageError(res.error)
+
+        return bucket.get_public_url(name)
+
+
+class LocalFileStorage:
+    """Writes files under a local directory; a stand-in for tests and benchmarks."""
+
+    def __init__(self, root, base_url):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def upload(self, name, data, content_type):
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(bytes(data))
+        return f"{self.base_url}/{name}"
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """Returns the process-wide storage selected by `STORAGE_BACKEND`."""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                if settings.STORAGE_BACKEND == "local":
+                    _storage = LocalFileStorage(
+                        settings.LOCAL_STORAGE_ROOT, settings.LOCAL_STORAGE_URL
+                    )
+                else:
+                    _storage = SupabaseStorage(
+                        settings.SUPABASE_URL,
+                        settings.SUPABASE_SERVICE_ROLE_KEY,
+                        settings.SUPABASE_BUCKET,
+                    )
+    return _storage
@@ -0,0 +1,86 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection
+
+from services.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+
+def upload_with_retries(name, data, content_type, retries, backoff):
+    """Uploads through the configured storage, retrying with exponential backoff."""
+    for attempt in range(retries + 1):
+        try:
+            return get_storage().upload(name, data, content_type)
+        except Exception:
+            if attempt == retries:
+                raise
+            delay = backoff * (2**attempt)
+            logger.warning("Upload of %s failed, retrying in %.1fs", name, delay, exc_info=True)
+            time.sleep(delay)
+
+
+def _save_profile_picture(user_id, name, main, thumbnail):
+    from college.models import User
+
+    url = upload_with_retries(
+        f"{name}.{main.ext}",
+        main.data,
+        main.content_type,
+        settings.UPLOAD_RETRIES,
+        settings.UPLOAD_RETRY_BACKOFF,
+    )
+    thumbnail_url = upload_with_retries(
+        f"{name}_thumb.{thumbnail.ext}",
+        thumbnail.data,
+        thumbnail.content_type,
+        settings.UPLOAD_RETRIES,
+        settings.UPLOAD_RETRY_BACKOFF,
+    )
+    User.objects.filter(pk=user_id).update(profile_picture=url, thumbnail_url=thumbnail_url)
+    return url
+
+
+def _save_profile_picture_in_background(user_id, name, main, thumbnail):
+    try:
+        _save_profile_picture(user_id, name, main, thumbnail)
+    except Exception:
+        logger.exception("Giving up on profile picture upload for user %s", user_id)
+    finally:
+        connection.close()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.UPLOAD_WORKERS, thread_name_prefix="upload"
+                )
+    return _executor
+
+
+def enqueue_profile_picture(user_id, main, thumbnail):
+    """
+    Uploads a processed profile picture and its thumbnail in the background
+    and stores both URLs on the user once the uploads succeed. With
+    UPLOAD_ASYNC disabled the uploads run inline, the URL is returned and
+    an upload that fails after its retries raises.
+    """
+    name = str(uuid.uuid4())
+    if not settings.UPLOAD_ASYNC:
+        return _save_profile_picture(user_id, name, main, thumbnail)
+    _get_executor().submit(
+        _save_profile_picture_in_background, user_id, name, main, thumbnail
+    )
+    return None
@@ -0,0 +1,76 @@
+import io
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+ALLOWED_FORMATS = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+
+
+class InvalidImage(ValueError):
+    """Raised when an upload is too large or not an accepted image."""
+
+
+def decode_image(file_bytes):
+    """Decodes image bytes into an upright RGB PIL image."""
+    pil_img = Image.open(io.BytesIO(file_bytes))
+    pil_img = ImageOps.exif_transpose(pil_img)
+    if pil_img.mode != "RGB":
+        pil_img = pil_img.convert("RGB")
+    return pil_img
+
+
+class UploadedImage:
+    """
+    An uploaded image read into memory exactly once.
+
+    The format and dimensions are checked from the header alone; the pixels
+    are decoded on first access to `image` and cached. Pickling (to hand the
+    upload to the face process pool) ships only the raw bytes.
+    """
+
+    def __init__(self, data, name=None, max_bytes=None, max_pixels=None):
+        self.data = data
+        self.name = name
+        if max_bytes and len(data) > max_bytes:
+            raise InvalidImage(f"Image is larger than {max_bytes // (1024 * 1024)} MB.")
+        self.format, self.size = self._inspect(max_pixels)
+        self._image = None
+
+    @classmethod
+    def from_file(cls, uploaded_file, max_bytes=None, max_pixels=None):
+        """Reads a Django UploadedFile, refusing oversized ones before reading."""
+        from django.conf import settings
+
+        max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+        max_pixels = max_pixels or settings.UPLOAD_MAX_PIXELS
+        if uploaded_file.size and uploaded_file.size > max_bytes:
+            raise InvalidImage(f"Image is larger than {max_bytes // (1024 * 1024)} MB.")
+        uploaded_file.seek(0)
+        return cls(uploaded_file.read(), uploaded_file.name, max_bytes, max_pixels)
+
+    def _inspect(self, max_pixels):
+        try:
+            with Image.open(io.BytesIO(self.data)) as header:
+                fmt, size = header.format, header.size
+        except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+            raise InvalidImage("File is not a supported image.")
+        if fmt not in ALLOWED_FORMATS:
+            raise InvalidImage(f"Unsupported image format {fmt}.")
+        if max_pixels and size[0] * size[1] > max_pixels:
+            raise InvalidImage("Image dimensions are too large.")
+        return fmt, size
+
+    @property
+    def content_type(self):
+        return ALLOWED_FORMATS[self.format]
+
+    @property
+    def image(self):
+        if self._image is None:
+            self._image = decode_image(self.data)
+        return self._image
+
+    def __getstate__(self):
+        return {**self.__dict__, "_image": None}
+
+    def __len__(self):
+        return len(self.data)
@@ -0,0 +1,214 @@
+import csv
+import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+# Below this many passwords the pool start-up costs more than it saves.
+MIN_ROWS_FOR_POOL = 50
+
+
+@dataclass
+class ImportReport:
+    total: int = 0
+    created: int = 0
+    errors: list = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    def add_error(self, row, errors):
+        self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "total": self.total,
+            "created": self.created,
+            "failed": len(self.errors),
+            "errors": self.errors,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+        }
+
+
+class InvalidCSV(ValueError):
+    """Raised when an uploaded CSV is not UTF-8 or can't be parsed."""
+
+
+def read_csv_rows(file_obj):
+    """
+    Reads an uploaded CSV (with a header row) into dicts. Blank and missing
+    trailing values become None.
+    """
+    text = io.TextIOWrapper(file_obj, encoding="utf-8-sig", newline="")
+    try:
+        return [
+            {
+                key.strip(): ((value or "").strip() or None)
+                for key, value in row.items()
+                if key
+            }
+            for row in csv.DictReader(text)
+        ]
+    except UnicodeDecodeError:
+        raise InvalidCSV("CSV file must be UTF-8 encoded")
+    except csv.Error as e:
+        raise InvalidCSV(f"Malformed CSV: {e}")
+    finally:
+        text.detach()
+
+
+def _init_hasher():
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "main.settings")
+    django.setup()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    """One hashing pool per process, sized by the first caller, reused after."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_hasher,
+            )
+        return _pool
+
+
+def hash_passwords(passwords, workers=None):
+    """PBKDF2-hashes passwords across processes; None becomes unusable."""
+    workers = workers or settings.USER_IMPORT_WORKERS or os.cpu_count() or 1
+    if workers == 1 or len(passwords) < MIN_ROWS_FOR_POOL:
+        return [make_password(password) for password in passwords]
+
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(_get_pool(workers).map(make_password, passwords, chunksize=chunksize))
+
+
+def _validate(rows, report):
+    """Per-row field validation plus in-file duplicate checks; returns valid rows."""
+    from college.serializers import UserImportSerializer
+
+    valid = []
+    seen_emails, seen_college_ids = set(), set()
+    for index, row in enumerate(rows):
+        serializer = UserImportSerializer(data=row)
+        if not serializer.is_valid():
+            report.add_error(index, serializer.errors)
+            continue
+        data = serializer.validated_data
+        errors = {}
+        if data["email"] in seen_emails:
+            errors["email"] = ["Duplicate email in import."]
+        if data.get("college_id") and data["college_id"] in seen_college_ids:
+            errors["college_id"] = ["Duplicate college_id in import."]
+        if errors:
+            report.add_error(index, errors)
+            continue
+        seen_emails.add(data["email"])
+        if data.get("college_id"):
+            seen_college_ids.add(data["college_id"])
+        valid.append((index, data))
+    return valid
+
+
+def _check_database(valid, report):
+    """One query each for taken email/college_id values and unknown batches."""
+    from college.models import Batch, User
+
+    emails = {data["email"] for _, data in valid}
+    college_ids = {data["college_id"] for _, data in valid if data.get("college_id")}
+    batch_ids = {data["batch"] for _, data in valid if data.get("batch")}
+
+    taken_emails, taken_college_ids = set(), set()
+    for email, college_id in User.objects.filter(
+        Q(email__in=emails) | Q(college_id__in=college_ids)
+    ).values_list("email", "college_id"):
+        taken_emails.add(email)
+        taken_college_ids.add(college_id)
+    known_batches = set(
+        Batch.objects.filter(pk__in=batch_ids).values_list("id", flat=True)
+    )
+
+    remaining = []
+    for index, data in valid:
+        errors = {}
+        if data["email"] in taken_emails:
+            errors["email"] = ["user with this email already exists."]
+        if data.get("college_id") and data["college_id"] in taken_college_ids:
+            errors["college_id"] = ["user with this college id already exists."]
+        if data.get("batch") and data["batch"] not in known_batches:
+            errors["batch"] = [f"Invalid pk \"{data['batch']}\" - object does not exist."]
+        if errors:
+            report.add_error(index, errors)
+        else:
+            remaining.append((index, data))
+    return remaining
+
+
+def _insert_chunk(users, indexes, report):
+    from college.models import User
+
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+        report.created += len(users)
+    except IntegrityError:
+        # A concurrent write took one of the values; retry row by row so
+        # only the conflicting rows fail.
+        for user, index in zip(users, indexes):
+            try:
+                with transaction.atomic():
+                    user.save(force_insert=True)
+                report.created += 1
+            except IntegrityError as e:
+                report.add_error(index, {"non_field_errors": [str(e).splitlines()[0]]})
+
+
+def import_users(rows, chunk_size=None, workers=None, progress=None):
+    """
+    Validates and creates users in bulk.
+
+    Uniqueness of email/college_id is checked in one query, passwords are
+    hashed in a process pool and rows are inserted with bulk_create in
+    chunks. `progress(done, total)` is called after every chunk. Returns an
+    ImportReport with per-row errors keyed by the row's position.
+    """
+    from college.models import User
+
+    started = time.perf_counter()
+    chunk_size = chunk_size or settings.USER_IMPORT_CHUNK_SIZE
+    report = ImportReport(total=len(rows))
+
+    valid = _check_database(_validate(rows, report), report)
+    hashes = hash_passwords([data.get("password") for _, data in valid], workers)
+
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start : start + chunk_size]
+        users = []
+        for (index, data), password in zip(chunk, hashes[start : start + chunk_size]):
+            fields = {
+                key: value
+                for key, value in data.items()
+                if key not in ("password", "batch")
+            }
+            users.append(User(**fields, batch_id=data.get("batch"), password=password))
+        _insert_chunk(users, [index for index, _ in chunk], report)
+        if progress:
+            progress(min(start + chunk_size, len(valid)), len(valid))
+
+    report.errors.sort(key=lambda error: error["row"])
+    report.elapsed_ms = (time.perf_counter() - started) * 1000
+    return report
@@ -0,0 +1,381 @@
+import heapq
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from services.attendance_finalizer import finalize_window
+from services.cache import record, single_flight
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WindowSnapshot:
+    """
+    Serialized attendance window plus what the attendance views need
+    without touching the database.
+    """
+
+    data: dict
+    university_id: int | None = None
+    cached_at: float = field(default_factory=time.monotonic, compare=False)
+
+    @classmethod
+    def from_window(cls, window):
+        from college.serializers import Attendance_WindowSerializer
+
+        batch = window.target_batch
+        return cls(
+            data=dict(Attendance_WindowSerializer(window).data),
+            university_id=batch.course.university_id if batch and batch.course else None,
+        )
+
+    @property
+    def id(self):
+        return self.data["id"]
+
+    @property
+    def target_batch_id(self):
+        return self.data["target_batch"]
+
+    @property
+    def target_subject_id(self):
+        return self.data["target_subject"]
+
+    @property
+    def is_active(self):
+        return self.data["is_active"]
+
+    @property
+    def start_time(self):
+        return parse_datetime(self.data["start_time"])
+
+    @property
+    def ends_at(self):
+        return self.start_time + timedelta(seconds=int(self.data["duration"]))
+
+    def is_expired(self, now=None):
+        return (now or timezone.now()) > self.ends_at
+
+    def closed(self):
+        return WindowSnapshot({**self.data, "is_active": False}, self.university_id)
+
+    def to_json(self):
+        return json.dumps({"data": self.data, "university_id": self.university_id})
+
+    @classmethod
+    def from_json(cls, raw):
+        payload = json.loads(raw)
+        return cls(payload["data"], payload["university_id"])
+
+
+class InMemoryWindowStore:
+    """Per-process store; entries older than `ttl` seconds count as misses."""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._by_id = {}
+        self._latest = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, snapshot):
+        if snapshot and time.monotonic() - snapshot.cached_at < self.ttl:
+            return snapshot
+        return None
+
+    def get(self, batch_id, subject_id):
+        with self._lock:
+            window_id = self._latest.get((batch_id, subject_id))
+            return self._fresh(self._by_id.get(window_id))
+
+    def get_by_id(self, window_id):
+        with self._lock:
+            return self._fresh(self._by_id.get(window_id))
+
+    def put(self, snapshot):
+        key = (snapshot.target_batch_id, snapshot.target_subject_id)
+        with self._lock:
+            self._by_id[snapshot.id] = snapshot
+            if self._latest.get(key, 0) <= snapshot.id:
+                self._latest[key] = snapshot.id
+
+    def discard(self, window_id):
+        with self._lock:
+            self._by_id.pop(window_id, None)
+
+
+class RedisWindowStore:
+    """Shared store for multi-worker deployments (any Redis-protocol server)."""
+
+    def __init__(self, url, ttl, prefix="attendance-window"):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImproperlyConfigured(
+                "WINDOW_REGISTRY_BACKEND='redis' requires the 'redis' package"
+            ) from e
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _id_key(self, window_id):
+        return f"{self.prefix}:id:{window_id}"
+
+    def _latest_key(self, batch_id, subject_id):
+        return f"{self.prefix}:latest:{batch_id}:{subject_id}"
+
+    def get(self, batch_id, subject_id):
+        window_id = self.client.get(self._latest_key(batch_id, subject_id))
+        return self.get_by_id(int(window_id)) if window_id else None
+
+    def get_by_id(self, window_id):
+        raw = self.client.get(self._id_key(window_id))
+        return WindowSnapshot.from_json(raw) if raw else None
+
+    def put(self, snapshot):
+        latest_key = self._latest_key(snapshot.target_batch_id, snapshot.target_subject_id)
+        current = self.client.get(latest_key)
+        pipe = self.client.pipeline()
+        pipe.set(self._id_key(snapshot.id), snapshot.to_json(), ex=self.ttl)
+        if not current or int(current) <= snapshot.id:
+            pipe.set(latest_key, snapshot.id, ex=self.ttl)
+        pipe.execute()
+
+    def discard(self, window_id):
+        self.client.delete(self._id_key(window_id))
+
+
+class CacheWindowStore:
+    """Store on the Django cache, shared as widely as CACHES is."""
+
+    def __init__(self, ttl, prefix="window"):
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _id_key(self, window_id):
+        return f"{self.prefix}:id:{window_id}"
+
+    def _latest_key(self, batch_id, subject_id):
+        return f"{self.prefix}:latest:{batch_id}:{subject_id}"
+
+    def get(self, batch_id, subject_id):
+        window_id = cache.get(self._latest_key(batch_id, subject_id))
+        return self.get_by_id(window_id) if window_id else None
+
+    def get_by_id(self, window_id):
+        raw = cache.get(self._id_key(window_id))
+        record(self.prefix, hit=raw is not None)
+        return WindowSnapshot.from_json(raw) if raw else None
+
+    def put(self, snapshot):
+        latest_key = self._latest_key(snapshot.target_batch_id, snapshot.target_subject_id)
+        cache.set(self._id_key(snapshot.id), snapshot.to_json(), timeout=self.ttl)
+        current = cache.get(latest_key)
+        if not current or current <= snapshot.id:
+            cache.set(latest_key, snapshot.id, timeout=self.ttl)
+
+    def discard(self, window_id):
+        cache.delete(self._id_key(window_id))
+
+
+def close_expired_windows(window_ids, now=None):
+    """
+    Closes the given windows in one UPDATE, but only those that are still
+    active and whose `start_time + duration` has passed in the database (a
+    window restarted elsewhere is left alone). Returns the closed ids.
+    """
+    from college.models import Attendance_Window
+
+    if not window_ids:
+        return []
+    table = connection.ops.quote_name(Attendance_Window._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET is_active = false "
+            "WHERE id = ANY(%s) AND is_active "
+            "AND start_time + duration * interval '1 second' <= %s "
+            "RETURNING id",
+            [list(window_ids), now or timezone.now()],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+class ExpiryScheduler:
+    """
+    Background thread that closes active windows when they expire. Windows
+    that expire within `batch_window` seconds of each other share one UPDATE.
+    """
+
+    def __init__(self, registry, batch_window=1.0):
+        self.registry = registry
+        self.batch_window = batch_window
+        self._heap = []
+        self._scheduled = {}
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="attendance-window-expiry", daemon=True
+                )
+                self._thread.start()
+
+    def schedule(self, snapshot):
+        if not snapshot.is_active:
+            return
+        due_at = snapshot.ends_at.timestamp()
+        with self._cond:
+            if self._scheduled.get(snapshot.id) == due_at:
+                return
+            self._scheduled[snapshot.id] = due_at
+            heapq.heappush(self._heap, (due_at, snapshot.id))
+            self._cond.notify()
+
+    def _due(self):
+        with self._cond:
+            while True:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                delay = self._heap[0][0] - time.time()
+                if delay > 0:
+                    self._cond.wait(timeout=delay)
+                    continue
+                cutoff = time.time() + self.batch_window
+                due = set()
+                while self._heap and self._heap[0][0] <= cutoff:
+                    due_at, window_id = heapq.heappop(self._heap)
+                    if self._scheduled.get(window_id) == due_at:
+                        del self._scheduled[window_id]
+                    due.add(window_id)
+                return due
+
+    def _run(self):
+        while True:
+            due = self._due()
+            # Let windows due within the batch window actually expire.
+            time.sleep(self.batch_window)
+            try:
+                self.registry.expire(due)
+            except Exception:
+                logger.exception("Failed to close expired attendance windows %s", due)
+            finally:
+                connections.close_all()
+
+
+class WindowRegistry:
+    """
+    Attendance windows keyed by (batch, subject) and by id, served from the
+    store and loaded from the database only on a miss.
+    """
+
+    def __init__(self, store, scheduler_enabled=True):
+        self.store = store
+        self.scheduler = ExpiryScheduler(self) if scheduler_enabled else None
+
+    def _queryset(self):
+        from college.models import Attendance_Window
+
+        return Attendance_Window.objects.select_related("target_batch__course")
+
+    def bootstrap(self):
+        """Schedules every window that is active in the database."""
+        if self.scheduler is None:
+            return
+        for window in self._queryset().filter(is_active=True):
+            self.put(window)
+        self.scheduler.start()
+
+    def put(self, window):
+        snapshot = WindowSnapshot.from_window(window)
+        self.store.put(snapshot)
+        if self.scheduler:
+            self.scheduler.schedule(snapshot)
+        return snapshot
+
+    def get(self, batch_id, subject_id):
+        snapshot = self.store.get(batch_id, subject_id)
+        if snapshot is None:
+            # When a window opens the whole class asks at once; load it once.
+            with single_flight(f"window:latest:{batch_id}:{subject_id}"):
+                snapshot = self.store.get(batch_id, subject_id)
+                if snapshot is None:
+                    window = (
+                        self._queryset()
+                        .filter(target_batch_id=batch_id, target_subject_id=subject_id)
+                        .order_by("-id")
+                        .first()
+                    )
+                    snapshot = self.put(window) if window else None
+        return snapshot
+
+    def get_by_id(self, window_id):
+        snapshot = self.store.get_by_id(window_id)
+        if snapshot is None:
+            with single_flight(f"window:id:{window_id}"):
+                snapshot = self.store.get_by_id(window_id)
+                if snapshot is None:
+                    window = self._queryset().filter(pk=window_id).first()
+                    snapshot = self.put(window) if window else None
+        return snapshot
+
+    def refresh(self, window_id):
+        self.store.discard(window_id)
+        return self.get_by_id(window_id)
+
+    def expire(self, window_ids):
+        """
+        Closes expired windows in one UPDATE, updates their snapshots and
+        writes absentee records for the windows that were closed.
+        """
+        window_ids = set(window_ids)
+        closed = set(close_expired_windows(window_ids))
+        for window_id in window_ids:
+            snapshot = self.store.get_by_id(window_id)
+            if window_id in closed and snapshot:
+                self.store.put(snapshot.closed())
+            else:
+                self.store.discard(window_id)
+        if closed:
+            logger.info("Closed expired attendance windows %s", sorted(closed))
+        for window_id in closed:
+            finalize_window(window_id)
+        return closed
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_window_registry():
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                backend = settings.WINDOW_REGISTRY_BACKEND
+                if backend == "redis":
+                    store = RedisWindowStore(
+                        settings.WINDOW_REGISTRY_REDIS_URL, settings.WINDOW_REGISTRY_TTL
+                    )
+                elif backend == "cache":
+                    store = CacheWindowStore(settings.WINDOW_REGISTRY_TTL)
+                else:
+                    store = InMemoryWindowStore(settings.WINDOW_REGISTRY_TTL)
+                registry = WindowRegistry(
+                    store, scheduler_enabled=settings.WINDOW_EXPIRY_SCHEDULER
+                )
+                registry.bootstrap()
+                _registry = registry
+    return _registry